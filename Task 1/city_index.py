@@ -0,0 +1,147 @@
+"""
+Offline City Index
+Prefix search over a bundled city list, so the search box can suggest real
+cities as the user types and the app can query the API by coordinates
+instead of an ambiguous free-text name.
+
+The index is a sorted array of normalised names searched with bisect.
+It loads cities.csv next to this module by default. OpenWeatherMap's full
+city.list.json.gz, if placed next to it, is used instead.
+
+With only the bundled sample list, names the index does not know become
+unresolved Cities, queried by name (q=) as the app did before it had an
+index. The full list is authoritative (full_list is set): unknown names are
+rejected offline and never reach the API.
+"""
+
+import bisect
+import csv
+import gzip
+import json
+import os
+import unicodedata
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BUNDLED_CSV = os.path.join(HERE, "cities.csv")
+OWM_CITY_LIST = os.path.join(HERE, "city.list.json.gz")
+
+
+def normalize(text):
+    """Lower-case, accent-free, single-spaced form used for matching."""
+    text = unicodedata.normalize('NFKD', text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(text.casefold().replace(",", " ").split())
+
+
+class City:
+    """One entry of the city list."""
+
+    __slots__ = ('id', 'name', 'state', 'country', 'lat', 'lon')
+
+    def __init__(self, id, name, state, country, lat, lon):
+        self.id = id
+        self.name = name
+        self.state = state
+        self.country = country
+        self.lat = lat
+        self.lon = lon
+
+    @classmethod
+    def unresolved(cls, text):
+        """A city known only by the name the user typed."""
+        return cls(None, " ".join(text.split()), "", "", None, None)
+
+    @property
+    def label(self):
+        if self.state:
+            return f"{self.name}, {self.state}, {self.country}"
+        if self.country:
+            return f"{self.name}, {self.country}"
+        return self.name
+
+    @property
+    def key(self):
+        """Stable identity for request coalescing: the ID, else the name."""
+        return self.id if self.id is not None else f"q:{normalize(self.name)}"
+
+    def __repr__(self):
+        return f"City({self.id}, {self.label!r}, {self.lat}, {self.lon})"
+
+
+class CityIndex:
+    """Sorted-array prefix index over city names."""
+
+    def __init__(self, cities, full_list=False):
+        self.cities = list(cities)
+        # True when this is OWM's complete list, so unknown names do not exist
+        self.full_list = full_list
+        # Each city is findable by "name", "name cc" and "name state cc"
+        entries = []
+        for i, city in enumerate(self.cities):
+            name = normalize(city.name)
+            entries.append((name, i))
+            entries.append((f"{name} {city.country.lower()}", i))
+            if city.state:
+                entries.append((normalize(city.label), i))
+        entries.sort()
+        self.keys = [key for key, _ in entries]
+        self.rows = [i for _, i in entries]
+
+    @classmethod
+    def load(cls, path=None):
+        """Load the OWM city list if present, else the bundled CSV."""
+        if path is None:
+            path = OWM_CITY_LIST if os.path.exists(OWM_CITY_LIST) else BUNDLED_CSV
+        if path.endswith((".json", ".json.gz")):
+            opener = gzip.open if path.endswith(".gz") else open
+            with opener(path, 'rt', encoding='utf-8') as f:
+                raw = json.load(f)
+            cities = (City(c['id'], c['name'], c.get('state', ''), c['country'],
+                           c['coord']['lat'], c['coord']['lon'])
+                      for c in raw)
+            return cls(cities, full_list=True)
+        else:
+            with open(path, newline='', encoding='utf-8') as f:
+                cities = [City(int(r['id']), r['name'], r['state'], r['country'],
+                               float(r['lat']), float(r['lon']))
+                          for r in csv.DictReader(f)]
+        return cls(cities)
+
+    def __len__(self):
+        return len(self.cities)
+
+    def complete(self, prefix, limit=8):
+        """Cities whose name (or "name, country") starts with prefix."""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        start = bisect.bisect_left(self.keys, prefix)
+        seen = set()
+        found = []
+        for pos in range(start, len(self.keys)):
+            if not self.keys[pos].startswith(prefix):
+                break
+            row = self.rows[pos]
+            if row not in seen:
+                seen.add(row)
+                found.append(self.cities[row])
+                if len(found) >= limit:
+                    break
+        return found
+
+    def near(self, text, limit=8):
+        """Suggestions for a name the index lacks: completions of the
+        longest prefix of it (at least two characters) that has any."""
+        key = normalize(text)
+        for end in range(len(key), 1, -1):
+            found = self.complete(key[:end], limit)
+            if found:
+                return found
+        return []
+
+    def lookup(self, text):
+        """Cities exactly matching "name", "name, country" or a full label."""
+        key = normalize(text)
+        start = bisect.bisect_left(self.keys, key)
+        end = bisect.bisect_right(self.keys, key, lo=start)
+        return [self.cities[row] for row in dict.fromkeys(self.rows[start:end])]
@@ -2,10 +2,28 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
 import json
-import urllib.request
-import urllib.parse
+import logging
+import os
 import urllib.error
 import random
+import queue
+import time
+
+import perfmon
+from weather_cache import ObservationCache, format_age
+from weather_client import fetch_current_weather, sample_weather, shared_scheduler, PRIORITY_INTERACTIVE
+from weather_model import ObservationError
+from weather_core import observation_for, resolve_city, AmbiguousCityError, CityLookupError
+from weather_history import WeatherHistory
+from weather_chart import TimeSeriesChart, ForecastChart
+from weather_forecast import ForecastSeries, fetch_forecast, sample_forecast
+from city_index import CityIndex
+from weather_icons import IconCache
+
+# The HTTP round trips, timed on the scheduler's worker threads (get_weather
+# and load_forecast only time the lookup and the submission)
+timed_fetch_weather = perfmon.timed("weather.fetch")(fetch_current_weather)
+timed_fetch_forecast = perfmon.timed("weather.fetch_forecast")(fetch_forecast)
 
 class WeatherApp:
     def __init__(self, root):
@@ -33,6 +51,30 @@ class WeatherApp:
             'default': ['#2c3e50', '#34495e', '#3f566b']   # Default dark
         }
         
+        # Last known observation per city (stale-while-revalidate)
+        self.cache = ObservationCache()
+        self.displayed = None       # Payload currently on screen
+        self.fetch_seq = 0          # Incremented per search; older results are not displayed
+        self.results = queue.Queue()
+        self.pending_fetches = 0
+        # Rate-limited, coalescing scheduler shared by every fetch path
+        self.scheduler = shared_scheduler()
+        
+        # Offline city list for autocomplete and unambiguous lookups
+        self.cities = CityIndex.load()
+        self.selected_city = None
+        
+        # Time series of every real observation, for the history chart
+        self.history = WeatherHistory()
+        self.history_window = None
+        
+        # 5-day forecast view; cached alongside observations
+        self.forecast_window = None
+        self.forecast_city = None
+        
+        # Condition icons, decoded once and shared by every view
+        self.icons = IconCache(self.root)
+        
         self.setup_ui()
         self.set_background('default')
         
@@ -57,7 +99,7 @@ class WeatherApp:
         
         # City entry - FIXED: Remove rgba colors
         self.city_var = tk.StringVar()
-        city_entry = tk.Entry(
+        city_entry = self.city_entry = tk.Entry(
             search_frame,
             textvariable=self.city_var,
             font=('Arial', 14),
@@ -69,6 +111,25 @@ class WeatherApp:
         )
         city_entry.pack(side='left', fill='x', expand=True, ipady=8)
         city_entry.bind('<Return>', lambda e: self.get_weather())
+        city_entry.bind('<KeyRelease>', self.update_suggestions)
+        city_entry.bind('<Down>', self.focus_suggestions)
+        city_entry.bind('<Escape>', lambda e: self.hide_suggestions())
+        
+        # Autocomplete dropdown, placed under the entry while typing
+        self.suggestion_list = tk.Listbox(
+            main_frame,
+            font=('Arial', 12),
+            bg='#2c3e50',
+            fg='#ecf0f1',
+            selectbackground='#3498db',
+            relief='flat',
+            height=6,
+            activestyle='none'
+        )
+        self.suggestion_list.bind('<ButtonRelease-1>', self.choose_suggestion)
+        self.suggestion_list.bind('<Return>', self.choose_suggestion)
+        self.suggestion_list.bind('<Escape>', lambda e: (self.hide_suggestions(), city_entry.focus_set()))
+        self.suggested = []
         
         # Search button
         search_btn = tk.Button(
@@ -84,6 +145,34 @@ class WeatherApp:
         )
         search_btn.pack(side='right', padx=(10, 0), ipady=8)
         
+        # History button
+        history_btn = tk.Button(
+            search_frame,
+            text="📈",
+            command=self.show_history,
+            font=('Arial', 12, 'bold'),
+            bg='#3498db',
+            fg='white',
+            relief='flat',
+            padx=10,
+            cursor='hand2'
+        )
+        history_btn.pack(side='right', padx=(10, 0), ipady=8)
+        
+        # Forecast button
+        forecast_btn = tk.Button(
+            search_frame,
+            text="📅",
+            command=self.show_forecast,
+            font=('Arial', 12, 'bold'),
+            bg='#3498db',
+            fg='white',
+            relief='flat',
+            padx=10,
+            cursor='hand2'
+        )
+        forecast_btn.pack(side='right', padx=(10, 0), ipady=8)
+        
         # Weather display frame - FIXED: Remove rgba colors
         self.weather_frame = tk.Frame(main_frame, bg='#34495e', relief='raised', bd=2)
         self.weather_frame.pack(fill='both', expand=True, pady=(0, 20))
@@ -119,9 +208,11 @@ class WeatherApp:
         )
         default_label.pack(expand=True, fill='both')
         
-    def setup_weather_display(self, data, use_celsius=False):
+    @perfmon.timed("weather.setup_weather_display")
+    def setup_weather_display(self, observation):
+        """Render a WeatherObservation (see weather_model.parse_observation)."""
         # Get weather condition for background
-        weather_main = data['weather'][0]['main']
+        weather_main = observation.condition
         
         # Update background based on weather
         self.set_background(weather_main)
@@ -140,7 +231,7 @@ class WeatherApp:
         # City name
         city_label = tk.Label(
             info_frame,
-            text=f"{data['name']}, {data['sys']['country']}",
+            text=observation.location_text,
             font=('Arial', 20, 'bold'),
             bg='#34495e',
             fg='#ecf0f1'
@@ -148,34 +239,21 @@ class WeatherApp:
         city_label.pack(pady=(0, 10))
         
         # Weather icon and description
-        weather_desc = data['weather'][0]['description'].title()
-        
-        # Weather emoji mapping
-        weather_emojis = {
-            'Clear': '☀️',
-            'Clouds': '☁️',
-            'Rain': '🌧️',
-            'Drizzle': '🌦️',
-            'Thunderstorm': '⛈️',
-            'Snow': '❄️',
-            'Mist': '🌫️',
-            'Fog': '🌫️',
-            'Haze': '🌫️'
-        }
-        
-        emoji = weather_emojis.get(weather_main, '🌤️')
-        
         weather_icon_label = tk.Label(
             info_frame,
-            text=emoji,
+            text=observation.emoji,
             font=('Arial', 48),
             bg='#34495e'
         )
         weather_icon_label.pack(pady=(10, 5))
+        icon = self.icons.request(observation.icon,
+                                  lambda image: self.show_icon(weather_icon_label, image))
+        if icon is not None:
+            self.show_icon(weather_icon_label, icon)
         
         weather_desc_label = tk.Label(
             info_frame,
-            text=weather_desc,
+            text=observation.description,
             font=('Arial', 16),
             bg='#34495e',
             fg='#ecf0f1'
@@ -183,18 +261,9 @@ class WeatherApp:
         weather_desc_label.pack(pady=(0, 20))
         
         # Temperature
-        if use_celsius:
-            # API returns in Celsius when units=metric
-            temp_celsius = round(data['main']['temp'], 1)
-            temp_fahrenheit = round((temp_celsius * 9/5) + 32, 1)
-        else:
-            # API returns in Kelvin by default
-            temp_celsius = round(data['main']['temp'] - 273.15, 1)
-            temp_fahrenheit = round((temp_celsius * 9/5) + 32, 1)
-        
         temp_label = tk.Label(
             info_frame,
-            text=f"{temp_celsius}°C / {temp_fahrenheit}°F",
+            text=observation.temperature_text,
             font=('Arial', 24, 'bold'),
             bg='#34495e',
             fg='#e74c3c'
@@ -206,14 +275,9 @@ class WeatherApp:
         details_frame.pack(fill='x', pady=(0, 10))
         
         # Feels like temperature
-        if use_celsius:
-            feels_like = round(data['main']['feels_like'], 1)
-        else:
-            feels_like = round(data['main']['feels_like'] - 273.15, 1)
-            
         feels_like_label = tk.Label(
             details_frame,
-            text=f"Feels like: {feels_like}°C",
+            text=observation.feels_like_text,
             font=('Arial', 12),
             bg='#34495e',
             fg='#bdc3c7'
@@ -230,7 +294,7 @@ class WeatherApp:
         
         humidity_label = tk.Label(
             left_frame,
-            text=f"💧 Humidity: {data['main']['humidity']}%",
+            text=observation.humidity_text,
             font=('Arial', 11),
             bg='#34495e',
             fg='#3498db'
@@ -239,7 +303,7 @@ class WeatherApp:
         
         pressure_label = tk.Label(
             left_frame,
-            text=f"🌡️ Pressure: {data['main']['pressure']} hPa",
+            text=observation.pressure_text,
             font=('Arial', 11),
             bg='#34495e',
             fg='#3498db'
@@ -250,21 +314,19 @@ class WeatherApp:
         right_frame = tk.Frame(info_frame2, bg='#34495e')
         right_frame.pack(side='right', fill='x', expand=True)
         
-        if 'visibility' in data:
-            visibility_km = data['visibility'] / 1000
+        if observation.visibility_km is not None:
             visibility_label = tk.Label(
                 right_frame,
-                text=f"👁️ Visibility: {visibility_km} km",
+                text=observation.visibility_text,
                 font=('Arial', 11),
                 bg='#34495e',
                 fg='#3498db'
             )
             visibility_label.pack(anchor='e')
         
-        wind_speed = data['wind']['speed']
         wind_label = tk.Label(
             right_frame,
-            text=f"💨 Wind: {wind_speed} m/s",
+            text=observation.wind_text,
             font=('Arial', 11),
             bg='#34495e',
             fg='#3498db'
@@ -282,6 +344,12 @@ class WeatherApp:
         )
         updated_label.pack(pady=(20, 0))
     
+    def show_icon(self, label, image):
+        """Replace the emoji with the condition icon once it is available."""
+        if image is not None and label.winfo_exists():
+            label.configure(image=image, text='')
+            label.image = image  # Keep it alive even if the LRU drops it
+    
     def set_background(self, weather_condition):
         """Set background color based on weather condition"""
         colors = self.weather_backgrounds.get(weather_condition, self.weather_backgrounds['default'])
@@ -300,6 +368,7 @@ class WeatherApp:
             # Fallback to default color
             self.root.configure(bg='#2c3e50')
     
+    @perfmon.timed("weather.create_gradient")
     def create_gradient(self, canvas, color1, color2, color3):
         """Create a vertical gradient effect"""
         try:
@@ -418,6 +487,7 @@ class WeatherApp:
         except Exception:
             pass
     
+    @perfmon.timed("weather.update_ui_colors")
     def update_ui_colors(self, weather_condition):
         """Update UI element colors to match weather background"""
         try:
@@ -435,53 +505,206 @@ class WeatherApp:
         except Exception:
             pass  # Skip if color update fails
         
+    def use_sample_data(self):
+        return self.api_key == "YOUR_API_KEY_HERE" or not self.api_key.strip()
+    
+    def update_suggestions(self, event=None):
+        """Offer matching cities from the offline index as the user types."""
+        if event is not None and event.keysym in ('Return', 'Escape', 'Down', 'Up'):
+            return
+        text = self.city_var.get()
+        if self.selected_city is not None and text != self.selected_city.label:
+            self.selected_city = None
+        
+        suggested = self.cities.complete(text)
+        if not suggested or (len(suggested) == 1 and suggested[0].label == text):
+            self.hide_suggestions()
+            return
+        self.show_suggestions(suggested)
+    
+    def show_suggestions(self, cities):
+        """Drop the given cities down below the entry."""
+        self.suggested = cities
+        self.suggestion_list.delete(0, tk.END)
+        for city in self.suggested:
+            self.suggestion_list.insert(tk.END, city.label)
+        self.suggestion_list.config(height=len(self.suggested))
+        self.suggestion_list.place(in_=self.city_entry, relx=0, rely=1, relwidth=1)
+        self.suggestion_list.lift()
+    
+    def focus_suggestions(self, event=None):
+        if self.suggestion_list.winfo_ismapped():
+            self.suggestion_list.focus_set()
+            self.suggestion_list.selection_clear(0, tk.END)
+            self.suggestion_list.selection_set(0)
+            self.suggestion_list.activate(0)
+    
+    def hide_suggestions(self):
+        self.suggestion_list.place_forget()
+    
+    def choose_suggestion(self, event=None):
+        selection = self.suggestion_list.curselection()
+        if not selection:
+            return
+        self.selected_city = self.suggested[selection[0]]
+        self.city_var.set(self.selected_city.label)
+        self.hide_suggestions()
+        self.city_entry.focus_set()
+        self.city_entry.icursor(tk.END)
+        self.get_weather()
+    
+    def resolve_city(self, text):
+        """Map the entry text to a City (see weather_core.resolve_city).
+        
+        Raises CityLookupError, after offering any matches as
+        suggestions, when the user has to pick one or fix a typo.
+        """
+        if self.selected_city is not None and text == self.selected_city.label:
+            return self.selected_city
+        try:
+            return resolve_city(self.cities, text)
+        except CityLookupError as e:
+            if isinstance(e, AmbiguousCityError):
+                self.status_var.set(f"Several cities match '{text}' - pick one")
+            else:
+                self.status_var.set(f"No city named '{text}'"
+                                    + (" - did you mean one of these?" if e.matches else ""))
+            if e.matches:
+                self.show_suggestions(e.matches)
+            else:
+                self.hide_suggestions()
+            raise
+    
+    @perfmon.timed("weather.get_weather")
     def get_weather(self):
-        city = self.city_var.get().strip()
-        if not city:
+        text = self.city_var.get().strip()
+        if not text:
             messagebox.showwarning("Input Error", "Please enter a city name")
             return
-            
-        self.status_var.set("Fetching weather data...")
-        self.root.update()
         
+        # Names outside the sample index are queried as typed (q=)
         try:
-            # Check if API key is set
-            if self.api_key == "YOUR_API_KEY_HERE" or not self.api_key.strip():
-                # Sample data for demonstration
-                sample_data = self.get_sample_data(city)
-                self.setup_weather_display(sample_data)
-                self.status_var.set("Showing sample data - Add your API key for real data")
+            city = self.resolve_city(text)
+        except CityLookupError:
+            return
+        self.selected_city = city
+        self.city_var.set(city.label)
+        self.hide_suggestions()
+        
+        # Validate API key format (should be 32 characters)
+        if not self.use_sample_data() and len(self.api_key.strip()) != 32:
+            messagebox.showerror("API Key Error", 
+                "Invalid API key format. OpenWeatherMap API keys are 32 characters long.")
+            self.status_var.set("Invalid API key")
+            return
+        
+        self.fetch_seq += 1
+        
+        # Show the last known observation immediately, then revalidate
+        cached = self.cache.get(city.label)
+        shown = False
+        if cached is not None:
+            try:
+                self.show_observation(observation_for(city, cached.data, cached.celsius))
+                shown = True
+            except ObservationError:
+                pass  # Unusable cache entry; wait for the fresh fetch
+        
+        if shown:
+            self.status_var.set(f"Showing data from {format_age(cached.age())} - updating...")
+        else:
+            self.status_var.set("Fetching weather data...")
+        
+        self.start_polling()
+        if self.forecast_window is not None and self.forecast_window.winfo_viewable():
+            self.load_forecast(city)
+        
+        seq = self.fetch_seq
+        if self.use_sample_data():
+            # Sample data for demonstration (no network, so no quota to protect)
+            self.results.put((self.handle_result,
+                              self.make_result(seq, city, self.get_sample_data(city.name), None)))
+            return
+        
+        # Query by coordinates where known, which unlike names are unambiguous
+        future = self.scheduler.submit(
+            ('weather', city.key), timed_fetch_weather,
+            city, self.api_key, self.base_url, priority=PRIORITY_INTERACTIVE)
+        future.add_done_callback(lambda f: self.queue_result(seq, city, f))
+    
+    @staticmethod
+    def make_result(seq, city, data, error):
+        """Parse a payload into the (seq, city, data, observation, error) tuple
+        consumed by handle_result. Safe to call off the Tk thread."""
+        observation = None
+        if error is None:
+            try:
+                observation = observation_for(city, data)
+            except ObservationError as e:
+                error = e
+        return seq, city, data, observation, error
+    
+    def queue_result(self, seq, city, future):
+        """Runs on a scheduler thread; hand the outcome to the Tk thread."""
+        error = future.exception()
+        data = None if error else future.result()
+        self.results.put((self.handle_result, self.make_result(seq, city, data, error)))
+    
+    def start_polling(self):
+        """Count one more outstanding fetch, starting the poll loop if idle."""
+        self.pending_fetches += 1
+        if self.pending_fetches == 1:
+            self.root.after(50, self.poll_results)
+    
+    def poll_results(self):
+        """Apply finished fetches on the Tk thread."""
+        while True:
+            try:
+                handler, result = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.pending_fetches -= 1
+            handler(*result)
+        
+        if self.pending_fetches:
+            self.root.after(50, self.poll_results)
+    
+    def handle_result(self, seq, city, data, observation, error):
+        if error is None:
+            self.cache.put(city.label, data, True)
+            if not self.use_sample_data():
+                self.history.append(observation)
+                if self.history_window is not None and self.history_window.winfo_viewable():
+                    self.refresh_history()
+        
+        # A newer search has started; keep the cache warm but leave the screen alone
+        if seq != self.fetch_seq:
+            return
+        
+        if error is None:
+            if observation == self.displayed:
+                self.status_var.set("Weather data is up to date")
             else:
-                # Validate API key format (should be 32 characters)
-                if len(self.api_key.strip()) != 32:
-                    messagebox.showerror("API Key Error", 
-                        "Invalid API key format. OpenWeatherMap API keys are 32 characters long.")
-                    self.status_var.set("Invalid API key")
-                    return
-                
-                # Actual API call using urllib
-                params = urllib.parse.urlencode({
-                    'q': city,
-                    'appid': self.api_key.strip(),
-                    'units': 'metric'  # Get temperature in Celsius directly
-                })
-                url = f"{self.base_url}?{params}"
-                
-                print(f"API URL: {url}")  # Debug print
-                
-                # Create request with headers
-                req = urllib.request.Request(url)
-                req.add_header('User-Agent', 'WeatherApp/1.0')
-                
-                with urllib.request.urlopen(req, timeout=10) as response:
-                    if response.status == 200:
-                        data = json.loads(response.read().decode())
-                        print(f"API Response: {data}")  # Debug print
-                        self.setup_weather_display(data, use_celsius=True)
-                        self.status_var.set("Weather data updated successfully")
-                    else:
-                        raise Exception(f"HTTP Error: {response.status}")
-                
+                self.show_observation(observation)
+                if self.use_sample_data():
+                    self.status_var.set("Showing sample data - Add your API key for real data")
+                else:
+                    self.status_var.set("Weather data updated successfully")
+            return
+        
+        cached = self.cache.get(city.label)
+        if cached is not None:
+            self.status_var.set(f"Showing data from {format_age(cached.age())} - update failed")
+        else:
+            self.show_fetch_error(error)
+    
+    def show_observation(self, observation):
+        self.setup_weather_display(observation)
+        self.displayed = observation
+    
+    def show_fetch_error(self, error):
+        try:
+            raise error
         except urllib.error.HTTPError as e:
             error_msg = f"HTTP {e.code}"
             if e.code == 401:
@@ -499,39 +722,143 @@ class WeatherApp:
         except json.JSONDecodeError as e:
             messagebox.showerror("Data Error", "Invalid response format from weather service")
             self.status_var.set("Invalid response format")
-        except KeyError as e:
-            messagebox.showerror("Data Error", f"Missing data in response: {str(e)}")
+        except ObservationError as e:
+            messagebox.showerror("Data Error", str(e))
             self.status_var.set("Incomplete weather data")
         except Exception as e:
             messagebox.showerror("Error", f"An unexpected error occurred: {str(e)}")
             self.status_var.set("An error occurred")
     
+    HISTORY_RANGES = {"24 hours": 86400, "7 days": 7 * 86400,
+                      "30 days": 30 * 86400, "1 year": 365 * 86400}
+    
+    def show_history(self):
+        """Open (or re-show) the history chart for the current city."""
+        if self.history_window is None or not self.history_window.winfo_exists():
+            window = tk.Toplevel(self.root)
+            window.geometry("600x320")
+            window.configure(bg='#2c3e50')
+            window.protocol("WM_DELETE_WINDOW", window.withdraw)
+            
+            controls = tk.Frame(window, bg='#2c3e50')
+            controls.pack(fill='x', padx=10, pady=(10, 0))
+            self.history_range = tk.StringVar(value="7 days")
+            range_combo = ttk.Combobox(controls, textvariable=self.history_range,
+                                       values=list(self.HISTORY_RANGES), state='readonly', width=10)
+            range_combo.pack(side='right')
+            range_combo.bind('<<ComboboxSelected>>', lambda e: self.refresh_history())
+            
+            self.history_chart = TimeSeriesChart(window)
+            self.history_chart.pack(fill='both', expand=True, padx=10, pady=10)
+            self.history_window = window
+        
+        self.refresh_history()
+        self.history_window.deiconify()
+        self.history_window.lift()
+    
+    @perfmon.timed("weather.refresh_history")
+    def refresh_history(self):
+        city = self.displayed.location_text if self.displayed else self.city_var.get().strip()
+        self.history_window.title(f"History - {city}" if city else "History")
+        end = time.time()
+        start = end - self.HISTORY_RANGES[self.history_range.get()]
+        points = max(600, self.history_chart.canvas.winfo_width())
+        self.history_chart.set_series(*self.history.series(city, start, end, max_points=points))
+    
+    def show_forecast(self):
+        """Open (or re-show) the 5-day forecast for the current city."""
+        text = self.city_var.get().strip()
+        if self.selected_city is None and not text:
+            messagebox.showwarning("Input Error", "Please choose a city first")
+            return
+        try:
+            city = self.selected_city or self.resolve_city(text)
+        except CityLookupError:
+            return
+        
+        if self.forecast_window is None or not self.forecast_window.winfo_exists():
+            window = tk.Toplevel(self.root)
+            window.geometry("640x300")
+            window.configure(bg='#2c3e50')
+            window.protocol("WM_DELETE_WINDOW", window.withdraw)
+            
+            controls = tk.Frame(window, bg='#2c3e50')
+            controls.pack(fill='x', padx=10, pady=(10, 0))
+            self.forecast_status = tk.StringVar()
+            tk.Label(controls, textvariable=self.forecast_status, font=('Arial', 9),
+                     bg='#2c3e50', fg='#95a5a6').pack(side='left')
+            self.forecast_celsius = tk.BooleanVar(value=True)
+            for text, value in (("°F", False), ("°C", True)):
+                tk.Radiobutton(controls, text=text, variable=self.forecast_celsius, value=value,
+                               command=lambda: self.forecast_chart.set_celsius(self.forecast_celsius.get()),
+                               bg='#2c3e50', fg='#ecf0f1', selectcolor='#34495e',
+                               activebackground='#2c3e50').pack(side='right')
+            
+            self.forecast_chart = ForecastChart(window, icons=self.icons)
+            self.forecast_chart.pack(fill='both', expand=True, padx=10, pady=10)
+            self.forecast_window = window
+        
+        self.load_forecast(city)
+        self.forecast_window.deiconify()
+        self.forecast_window.lift()
+    
+    @perfmon.timed("weather.load_forecast")
+    def load_forecast(self, city):
+        """Show the cached forecast for city at once and revalidate it, the
+        same way get_weather treats observations."""
+        self.forecast_city = city
+        self.forecast_window.title(f"Forecast - {city.label}")
+        
+        cached = self.cache.get(f"forecast:{city.label}")
+        if cached is not None:
+            try:
+                self.forecast_chart.set_forecast(ForecastSeries.from_dict(cached.data))
+                self.forecast_status.set(f"From {format_age(cached.age())} - updating...")
+            except (KeyError, TypeError, ValueError):
+                cached = None
+        if cached is None:
+            self.forecast_chart.set_forecast(None)
+            self.forecast_status.set("Fetching forecast...")
+        
+        self.start_polling()
+        if self.use_sample_data():
+            self.results.put((self.handle_forecast, (city, sample_forecast(city.name), None)))
+            return
+        
+        future = self.scheduler.submit(
+            ('forecast', city.key), timed_fetch_forecast,
+            city, self.api_key, priority=PRIORITY_INTERACTIVE)
+        future.add_done_callback(lambda f: self.results.put(
+            (self.handle_forecast, (city, None if f.exception() else f.result(), f.exception()))))
+    
+    def handle_forecast(self, city, series, error):
+        if error is None:
+            self.cache.put(f"forecast:{city.label}", series.to_dict(), True)
+        
+        # The window has moved on to another city
+        if self.forecast_city is None or city.key != self.forecast_city.key:
+            return
+        
+        if error is None:
+            self.forecast_chart.set_forecast(series)
+            if self.use_sample_data():
+                self.forecast_status.set("Sample forecast")
+            else:
+                self.forecast_status.set("Forecast updated")
+        elif self.cache.get(f"forecast:{city.label}") is not None:
+            self.forecast_status.set("Showing cached forecast - update failed")
+        else:
+            self.forecast_status.set(f"Forecast unavailable: {error}")
+    
     def get_sample_data(self, city):
         """Generate sample weather data for demonstration"""
-        weather_conditions = [
-            {'main': 'Clear', 'description': 'clear sky'},
-            {'main': 'Clouds', 'description': 'few clouds'},
-            {'main': 'Rain', 'description': 'light rain'},
-            {'main': 'Snow', 'description': 'light snow'}
-        ]
-        
-        return {
-            'name': city.title(),
-            'sys': {'country': 'XX'},
-            'weather': [random.choice(weather_conditions)],
-            'main': {
-                'temp': random.uniform(15, 30),  # Random temp between 15-30°C
-                'feels_like': random.uniform(15, 32),
-                'humidity': random.randint(40, 80),
-                'pressure': random.randint(1000, 1020)
-            },
-            'wind': {'speed': random.uniform(1, 8)},
-            'visibility': random.randint(8000, 10000)
-        }
+        return sample_weather(city)
 
 def main():
+    logging.basicConfig(level=os.environ.get("WEATHER_LOG_LEVEL", "WARNING").upper())
     root = tk.Tk()
     app = WeatherApp(root)
+    perfmon.install(root)
     root.mainloop()
 
 if __name__ == "__main__":
@@ -0,0 +1,88 @@
+"""
+Weather Observation Cache
+Remembers the last observation fetched for each city so it can be shown
+instantly while a fresh copy is fetched in the background.
+"""
+
+import json
+import os
+import time
+
+
+def city_key(city):
+    """Normalise a city name for use as a cache key."""
+    return " ".join(city.lower().split())
+
+
+def format_age(seconds):
+    """Human readable age such as 'just now' or '5 min ago'."""
+    if seconds < 60:
+        return "just now"
+    if seconds < 3600:
+        return f"{int(seconds // 60)} min ago"
+    if seconds < 86400:
+        return f"{int(seconds // 3600)} h ago"
+    return f"{int(seconds // 86400)} days ago"
+
+
+class CachedObservation:
+    """One cached API payload and when it was fetched."""
+
+    __slots__ = ('data', 'celsius', 'fetched_at')
+
+    def __init__(self, data, celsius, fetched_at):
+        self.data = data
+        self.celsius = celsius
+        self.fetched_at = fetched_at
+
+    def age(self):
+        return max(0.0, time.time() - self.fetched_at)
+
+
+class ObservationCache:
+    """Last known observation per city, persisted to a JSON file."""
+
+    def __init__(self, filename="weather_cache.json", max_entries=200):
+        self.filename = filename
+        self.max_entries = max_entries
+        self.entries = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.filename, 'r') as f:
+                raw = json.load(f)
+            self.entries = {
+                key: CachedObservation(item['data'], item['celsius'], item['fetched_at'])
+                for key, item in raw.items()
+            }
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            self.entries = {}
+
+    def save(self):
+        raw = {
+            key: {'data': e.data, 'celsius': e.celsius, 'fetched_at': e.fetched_at}
+            for key, e in self.entries.items()
+        }
+        tmp_name = self.filename + ".tmp"
+        try:
+            with open(tmp_name, 'w') as f:
+                json.dump(raw, f)
+            os.replace(tmp_name, self.filename)
+        except OSError:
+            pass  # The cache is only an optimisation
+
+    def get(self, city):
+        """Return the CachedObservation for city, or None."""
+        return self.entries.get(city_key(city))
+
+    def put(self, city, data, celsius):
+        """Store a fresh payload for city and persist the cache."""
+        key = city_key(city)
+        self.entries.pop(key, None)
+        self.entries[key] = CachedObservation(data, celsius, time.time())
+        # Dicts keep insertion order, so the first keys are the least recent
+        while len(self.entries) > self.max_entries:
+            del self.entries[next(iter(self.entries))]
+        self.save()
+        return self.entries[key]
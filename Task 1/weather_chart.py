@@ -0,0 +1,294 @@
+"""
+Weather Charts
+Canvas charts for weather time series.
+
+Each metric is drawn as a single polyline whose coordinates are replaced on
+redraw (canvas.coords), so a chart costs a handful of canvas items however
+many points it shows. Series are decimated to roughly one point per pixel
+before drawing. The forecast chart likewise creates its bars and strip cells
+once and only moves or recolours them on redraw.
+"""
+
+import math
+import tkinter as tk
+from datetime import datetime
+
+# metric -> (label, colour)
+SERIES_STYLE = {
+    'temp_c': ("Temp °C", '#e74c3c'),
+    'feels_like_c': ("Feels °C", '#e67e22'),
+    'humidity': ("Humidity %", '#3498db'),
+    'pressure': ("Pressure hPa", '#9b59b6'),
+    'wind_speed': ("Wind m/s", '#2ecc71'),
+}
+
+# Forecast condition strip colours
+CONDITION_COLOURS = {
+    'Clear': '#f1c40f',
+    'Clouds': '#95a5a6',
+    'Rain': '#2980b9',
+    'Drizzle': '#5dade2',
+    'Thunderstorm': '#6c3483',
+    'Snow': '#ecf0f1',
+    'Mist': '#aeb6bf',
+    'Fog': '#aeb6bf',
+    'Haze': '#f7dc6f',
+}
+
+
+def to_fahrenheit(celsius):
+    return celsius * 9 / 5 + 32
+
+
+def decimate(xs, ys, max_points):
+    """Reduce a series to at most max_points by keeping each bucket's min and max.
+
+    Keeping both extremes preserves peaks that plain averaging would hide.
+    """
+    n = len(xs)
+    if n <= max_points:
+        return list(xs), list(ys)
+    buckets = max(1, max_points // 2)
+    out_x, out_y = [], []
+    for b in range(buckets):
+        lo = b * n // buckets
+        hi = max(lo + 1, (b + 1) * n // buckets)
+        chunk = range(lo, hi)
+        i_min = min(chunk, key=ys.__getitem__)
+        i_max = max(chunk, key=ys.__getitem__)
+        for i in sorted({i_min, i_max}):
+            out_x.append(xs[i])
+            out_y.append(ys[i])
+    return out_x, out_y
+
+
+class TimeSeriesChart:
+    """Line chart with one independently scaled polyline per metric."""
+
+    PAD_LEFT, PAD_RIGHT, PAD_TOP, PAD_BOTTOM = 10, 10, 24, 22
+
+    def __init__(self, parent, metrics=('temp_c', 'humidity', 'wind_speed'), **canvas_options):
+        options = dict(bg='#2c3e50', highlightthickness=0)
+        options.update(canvas_options)
+        self.canvas = tk.Canvas(parent, **options)
+        self.metrics = metrics
+        self.series = ([], {})
+        self.lines = {}
+        self.legend = {}
+        self.axis_labels = []
+        self.empty_text = None
+        self.canvas.bind('<Configure>', lambda e: self.redraw())
+
+    def pack(self, **kwargs):
+        self.canvas.pack(**kwargs)
+
+    def set_series(self, timestamps, columns):
+        """Replace the data shown and redraw."""
+        self.series = (timestamps, columns)
+        self.redraw()
+
+    def _ensure_items(self):
+        if self.lines:
+            return
+        c = self.canvas
+        for i, metric in enumerate(self.metrics):
+            label, colour = SERIES_STYLE.get(metric, (metric, '#ecf0f1'))
+            self.lines[metric] = c.create_line(0, 0, 0, 0, fill=colour, width=2, state='hidden')
+            self.legend[metric] = c.create_text(self.PAD_LEFT + i * 150, 6, anchor='nw',
+                                                fill=colour, font=('Arial', 9), text=label)
+        self.axis_labels = [c.create_text(0, 0, anchor=a, fill='#bdc3c7', font=('Arial', 8))
+                            for a in ('sw', 'se')]
+        self.empty_text = c.create_text(0, 0, text="No history yet", fill='#95a5a6',
+                                        font=('Arial', 12), state='hidden')
+
+    def redraw(self):
+        self._ensure_items()
+        c = self.canvas
+        width, height = c.winfo_width(), c.winfo_height()
+        if width < 2 or height < 2:
+            return
+        timestamps, columns = self.series
+        plot_w = width - self.PAD_LEFT - self.PAD_RIGHT
+        plot_h = height - self.PAD_TOP - self.PAD_BOTTOM
+
+        if len(timestamps) < 2:
+            for item in self.lines.values():
+                c.itemconfigure(item, state='hidden')
+            for item in self.axis_labels:
+                c.itemconfigure(item, text="")
+            c.coords(self.empty_text, width / 2, height / 2)
+            c.itemconfigure(self.empty_text, state='normal')
+            return
+        c.itemconfigure(self.empty_text, state='hidden')
+
+        t0, t1 = timestamps[0], timestamps[-1]
+        t_span = max(1, t1 - t0)
+        for metric in self.metrics:
+            label, _ = SERIES_STYLE.get(metric, (metric, None))
+            xs, ys = decimate(timestamps, columns[metric], plot_w)
+            lo, hi = min(ys), max(ys)
+            span = (hi - lo) or 1
+            coords = []
+            for t, v in zip(xs, ys):
+                coords.append(self.PAD_LEFT + (t - t0) / t_span * plot_w)
+                coords.append(self.PAD_TOP + (1 - (v - lo) / span) * plot_h)
+            if len(coords) == 2:
+                coords *= 2  # A line needs two points
+            c.coords(self.lines[metric], *coords)
+            c.itemconfigure(self.lines[metric], state='normal')
+            c.itemconfigure(self.legend[metric], text=f"{label} {lo:.0f}–{hi:.0f}")
+
+        fmt = "%d %b %H:%M" if t_span < 7 * 86400 else "%d %b %Y"
+        c.coords(self.axis_labels[0], self.PAD_LEFT, height - 4)
+        c.itemconfigure(self.axis_labels[0], text=datetime.fromtimestamp(t0).strftime(fmt))
+        c.coords(self.axis_labels[1], width - self.PAD_RIGHT, height - 4)
+        c.itemconfigure(self.axis_labels[1], text=datetime.fromtimestamp(t1).strftime(fmt))
+
+
+class ForecastChart:
+    """Forecast view on one canvas: temperature curve, precipitation bars
+    and a strip of condition colours, with day labels underneath. Given an
+    IconCache, a row of condition icons is drawn above the curve.
+
+    Canvas items are pooled; set_forecast(), set_celsius() and resizes only
+    update coordinates, text and colours of existing items.
+    """
+
+    PAD_LEFT, PAD_RIGHT, PAD_TOP, PAD_BOTTOM = 10, 10, 24, 20
+    STRIP_HEIGHT = 12
+    BAR_SHARE = 0.3  # Fraction of the plot height used by precipitation bars
+    ICON_ROW, ICON_SCALE = 30, 4  # OWM's 100 px icons shown at 25 px
+
+    def __init__(self, parent, icons=None, **canvas_options):
+        options = dict(bg='#2c3e50', highlightthickness=0)
+        options.update(canvas_options)
+        self.canvas = tk.Canvas(parent, **options)
+        self.series = None
+        self.celsius = True
+        self.pools = {}
+        self.icons = icons
+        self.icons_awaited = set()
+        c = self.canvas
+        self.temp_line = c.create_line(0, 0, 0, 0, fill=SERIES_STYLE['temp_c'][1], width=2,
+                                       smooth=True, state='hidden')
+        self.temp_label = c.create_text(self.PAD_LEFT, 6, anchor='nw', font=('Arial', 9),
+                                        fill=SERIES_STYLE['temp_c'][1])
+        self.precip_label = c.create_text(self.PAD_LEFT + 180, 6, anchor='nw', font=('Arial', 9),
+                                          fill='#3498db')
+        self.empty_text = c.create_text(0, 0, text="No forecast loaded", fill='#95a5a6',
+                                        font=('Arial', 12), state='hidden')
+        self.canvas.bind('<Configure>', lambda e: self.redraw())
+
+    def pack(self, **kwargs):
+        self.canvas.pack(**kwargs)
+
+    def set_forecast(self, series):
+        self.series = series
+        self.redraw()
+
+    def set_celsius(self, celsius):
+        self.celsius = celsius
+        self.redraw()
+
+    def _pool(self, name, count, create):
+        """Return count items of a kind, creating only the missing ones and
+        hiding any surplus."""
+        items = self.pools.setdefault(name, [])
+        while len(items) < count:
+            items.append(create())
+        for item in items[count:]:
+            self.canvas.itemconfigure(item, state='hidden')
+        return items[:count]
+
+    def redraw(self):
+        c = self.canvas
+        width, height = c.winfo_width(), c.winfo_height()
+        if width < 2 or height < 2:
+            return
+        series = self.series
+        n = len(series) if series is not None else 0
+        plot_w = width - self.PAD_LEFT - self.PAD_RIGHT
+        strip_top = height - self.PAD_BOTTOM - self.STRIP_HEIGHT
+        plot_top = self.PAD_TOP + (self.ICON_ROW if self.icons else 0)
+        plot_h = strip_top - plot_top - 4
+        if n < 2 or plot_w <= 0 or plot_h <= 0:
+            # Nothing to plot, or a window too small to plot it in
+            c.itemconfigure(self.temp_line, state='hidden')
+            c.itemconfigure(self.temp_label, text="")
+            c.itemconfigure(self.precip_label, text="")
+            for name in list(self.pools):
+                self._pool(name, 0, None)
+            c.coords(self.empty_text, width / 2, height / 2)
+            c.itemconfigure(self.empty_text, state='normal' if n < 2 else 'hidden')
+            return
+        c.itemconfigure(self.empty_text, state='hidden')
+
+        slot_w = plot_w / n
+        xs = [self.PAD_LEFT + (i + 0.5) * slot_w for i in range(n)]
+
+        # Temperature curve over the whole plot area
+        temps = series.temp_c if self.celsius else [to_fahrenheit(t) for t in series.temp_c]
+        lo, hi = min(temps), max(temps)
+        span = (hi - lo) or 1
+        coords = []
+        for x, t in zip(xs, temps):
+            coords.append(x)
+            coords.append(plot_top + (1 - (t - lo) / span) * plot_h * (1 - self.BAR_SHARE))
+        c.coords(self.temp_line, *coords)
+        c.itemconfigure(self.temp_line, state='normal')
+        unit = "°C" if self.celsius else "°F"
+        c.itemconfigure(self.temp_label, text=f"Temp {unit} {lo:.0f}–{hi:.0f}")
+
+        # Precipitation bars along the bottom of the plot area
+        precip = series.precip_mm
+        top_mm = max(1.0, max(precip))
+        bar_h = plot_h * self.BAR_SHARE
+        bars = self._pool('bars', n, lambda: c.create_rectangle(
+            0, 0, 0, 0, fill='#3498db', outline=''))
+        for x, mm, bar in zip(xs, precip, bars):
+            c.coords(bar, x - slot_w * 0.35, strip_top - 4 - mm / top_mm * bar_h,
+                     x + slot_w * 0.35, strip_top - 4)
+            c.itemconfigure(bar, state='normal' if mm > 0 else 'hidden')
+        c.itemconfigure(self.precip_label, text=f"Precip mm/3h max {max(precip):.1f}")
+
+        # Condition strip, one cell per 3 h slot
+        cells = self._pool('cells', n, lambda: c.create_rectangle(0, 0, 0, 0, outline=''))
+        for i, (condition, cell) in enumerate(zip(series.condition, cells)):
+            c.coords(cell, self.PAD_LEFT + i * slot_w, strip_top,
+                     self.PAD_LEFT + (i + 1) * slot_w, strip_top + self.STRIP_HEIGHT)
+            c.itemconfigure(cell, fill=CONDITION_COLOURS.get(condition, '#7f8c8d'), state='normal')
+
+        if self.icons:
+            self._draw_icons(series, xs, slot_w)
+
+        # Day labels at each local-midnight boundary (and the first slot)
+        starts = [i for i, t in enumerate(series.times)
+                  if i == 0 or datetime.fromtimestamp(t).date()
+                  != datetime.fromtimestamp(series.times[i - 1]).date()]
+        labels = self._pool('days', len(starts), lambda: c.create_text(
+            0, 0, anchor='sw', fill='#bdc3c7', font=('Arial', 8)))
+        for i, label in zip(starts, labels):
+            c.coords(label, self.PAD_LEFT + i * slot_w + 2, height - 4)
+            c.itemconfigure(label, text=datetime.fromtimestamp(series.times[i]).strftime("%a"),
+                            state='normal')
+
+    def _draw_icons(self, series, xs, slot_w):
+        """Condition icons for every step-th slot, so they never overlap."""
+        c = self.canvas
+        size = 100 // self.ICON_SCALE
+        step = max(1, math.ceil(size / slot_w))
+        slots = range(0, len(series), step)
+        items = self._pool('icons', len(slots), lambda: c.create_image(0, 0, anchor='n'))
+        for i, item in zip(slots, items):
+            code = series.icon[i]
+            image = self.icons.get(code, self.ICON_SCALE)
+            if image is None and code not in self.icons_awaited:
+                self.icons_awaited.add(code)
+                image = self.icons.request(code, lambda img, code=code: self._icon_loaded(code),
+                                           scale=self.ICON_SCALE)
+            c.coords(item, xs[i], self.PAD_TOP)
+            c.itemconfigure(item, image=image or '', state='normal' if image else 'hidden')
+
+    def _icon_loaded(self, code):
+        self.icons_awaited.discard(code)
+        self.redraw()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Weather Command Line Interface
+Fetch current weather for many cities at once and print one JSON object
+per line (NDJSON) as each city completes. Does not import tkinter.
+
+Examples:
+    python weather_cli.py "London, GB" Paris "Portland, OR, US"
+    python weather_cli.py --sample < cities.txt
+    OWM_API_KEY=... python weather_cli.py --jobs 8 --rate 600 < cities.txt > out.ndjson
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+
+from weather_client import TokenBucket, RequestScheduler, FREE_TIER_CALLS_PER_MINUTE, PRIORITY_BATCH
+from weather_core import WeatherService, NetworkProvider, sample_provider, WEATHER_URL, CityLookupError
+
+
+def positive_int(text: str) -> int:
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, not {value}")
+    return value
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="weather", description="Fetch current weather for many cities.")
+    parser.add_argument("cities", nargs="*", help="city names; read one per line from stdin if omitted")
+    parser.add_argument("--api-key", default=os.environ.get("OWM_API_KEY", ""),
+                        help="OpenWeatherMap API key (default: $OWM_API_KEY)")
+    parser.add_argument("--sample", action="store_true", help="use offline sample data")
+    parser.add_argument("-j", "--jobs", type=positive_int, default=8, help="cities fetched at once (default: 8)")
+    parser.add_argument("--rate", type=float, default=FREE_TIER_CALLS_PER_MINUTE,
+                        help=f"API calls per minute (default: {FREE_TIER_CALLS_PER_MINUTE}, the free tier)")
+    parser.add_argument("--retries", type=int, default=2, help="retries for transient errors (default: 2)")
+    parser.add_argument("--timeout", type=float, default=10, help="seconds per HTTP request (default: 10)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log retries to stderr")
+    return parser
+
+
+def record(name, observation, error) -> dict:
+    if error is None:
+        return {"query": name, "ok": True, "observation": observation.to_dict()}
+    result = {"query": name, "ok": False, "error": f"{type(error).__name__}: {error}"}
+    if isinstance(error, CityLookupError) and error.matches:
+        # Any of these labels resolves uniquely on a rerun
+        result["choices"] = [city.label for city in error.matches]
+    return result
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+
+    # Blank names would match nothing offline and send an empty q= online
+    names = [name.strip() for name in args.cities or sys.stdin if name.strip()]
+    if args.sample or not args.api_key.strip():
+        if not args.sample:
+            sys.stderr.write("No API key given; using sample data\n")
+        provider = sample_provider
+    else:
+        bucket = TokenBucket(args.rate / 60, capacity=max(1, args.jobs))
+        scheduler = RequestScheduler(bucket, max_workers=args.jobs)
+        provider = NetworkProvider(args.api_key, WEATHER_URL, scheduler,
+                                   priority=PRIORITY_BATCH, timeout=args.timeout)
+
+    service = WeatherService(provider, retries=args.retries)
+    failures = 0
+    for name, observation, error in service.fetch_many(names, max_workers=args.jobs):
+        failures += error is not None
+        sys.stdout.write(json.dumps(record(name, observation, error), ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
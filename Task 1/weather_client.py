@@ -0,0 +1,263 @@
+"""
+OpenWeatherMap Client
+HTTP access to the weather API, kept free of tkinter so it can run on a
+background thread.
+
+Every upstream call should go through the shared RequestScheduler, which
+keeps the app under the free-tier quota:
+
+- a token bucket limits the call rate (FREE_TIER_CALLS_PER_MINUTE),
+- requests for the same key that are queued, in flight or just finished
+  share one upstream call,
+- calls over quota wait in a priority queue instead of failing, so an
+  interactive search overtakes background refreshes and batch jobs;
+- a call the server rejects with 429 empties the bucket and goes back in
+  the queue at its priority (up to MAX_RATE_LIMITED times).
+"""
+
+import heapq
+import itertools
+import json
+import logging
+import random
+import threading
+import time
+import urllib.request
+import urllib.parse
+import urllib.error
+from concurrent.futures import Future, ThreadPoolExecutor
+
+log = logging.getLogger(__name__)
+
+FREE_TIER_CALLS_PER_MINUTE = 60
+
+# Request priorities (lower runs first)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_REFRESH = 1
+PRIORITY_BATCH = 2
+
+# 429 answers a call may get before its caller sees the error
+MAX_RATE_LIMITED = 3
+
+
+class TokenBucket:
+    """Classic token bucket: rate tokens per second, at most capacity stored."""
+
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self):
+        """Take one token. Returns 0 on success, else seconds until one is available."""
+        with self.lock:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def drain(self):
+        """Empty the bucket, e.g. after the server answered 429."""
+        with self.lock:
+            self._refill()
+            self.tokens = 0.0
+
+
+class _Pending:
+    __slots__ = ('fn', 'args', 'priority', 'future', 'dispatched', 'rate_limited')
+
+    def __init__(self, fn, args, priority):
+        self.fn = fn
+        self.args = args
+        self.priority = priority
+        self.future = Future()
+        self.dispatched = False
+        self.rate_limited = 0
+
+
+class RequestScheduler:
+    """Rate-limited, coalescing, priority-ordered executor for API calls."""
+
+    def __init__(self, bucket, max_workers=4, reuse_window=10.0):
+        self.bucket = bucket
+        self.reuse_window = reuse_window
+        self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix="owm")
+        self.cond = threading.Condition()
+        self.heap = []
+        self.pending = {}   # key -> _Pending (queued or in flight)
+        self.recent = {}    # key -> (finished_at, Future) for successful calls
+        self.counter = itertools.count()
+        self.dispatcher = None
+
+    def submit(self, key, fn, *args, priority=PRIORITY_INTERACTIVE):
+        """Schedule fn(*args) under key and return a Future for its result.
+
+        A call for a key that is already queued or running, or that
+        succeeded within reuse_window seconds, returns the existing Future.
+        """
+        with self.cond:
+            hit = self.recent.get(key)
+            if hit is not None and time.monotonic() - hit[0] < self.reuse_window:
+                return hit[1]
+
+            entry = self.pending.get(key)
+            if entry is not None:
+                if not entry.dispatched and priority < entry.priority:
+                    entry.priority = priority
+                    heapq.heappush(self.heap, (priority, next(self.counter), key))
+                    self.cond.notify()
+                return entry.future
+
+            entry = self.pending[key] = _Pending(fn, args, priority)
+            heapq.heappush(self.heap, (priority, next(self.counter), key))
+            if self.dispatcher is None:
+                self.dispatcher = threading.Thread(target=self._dispatch, name="owm-dispatch", daemon=True)
+                self.dispatcher.start()
+            self.cond.notify()
+            return entry.future
+
+    def queued(self):
+        """Number of calls waiting for quota."""
+        with self.cond:
+            return sum(1 for e in self.pending.values() if not e.dispatched)
+
+    def _next_entry(self):
+        """Pop heap entries until a live, undispatched one is on top."""
+        while self.heap:
+            priority, _, key = self.heap[0]
+            entry = self.pending.get(key)
+            if entry is not None and not entry.dispatched and entry.priority == priority:
+                return key, entry
+            heapq.heappop(self.heap)  # superseded by a priority upgrade
+        return None
+
+    def _dispatch(self):
+        while True:
+            with self.cond:
+                found = self._next_entry()
+                if found is None:
+                    self.cond.wait()
+                    continue
+                wait = self.bucket.try_acquire()
+                if wait > 0:
+                    # New higher-priority work may arrive meanwhile
+                    self.cond.wait(wait)
+                    continue
+                heapq.heappop(self.heap)
+                key, entry = found
+                entry.dispatched = True
+            self.executor.submit(self._execute, key, entry)
+
+    def _execute(self, key, entry):
+        try:
+            result = entry.fn(*entry.args)
+        except BaseException as e:
+            if isinstance(e, urllib.error.HTTPError) and e.code == 429:
+                # Our bucket ran ahead of the server's count; wait for a
+                # fresh token and retry rather than failing the caller
+                self.bucket.drain()
+                with self.cond:
+                    entry.rate_limited += 1
+                    if entry.rate_limited < MAX_RATE_LIMITED:
+                        log.info("Rate limited; requeueing %s", key)
+                        entry.dispatched = False
+                        heapq.heappush(self.heap, (entry.priority, next(self.counter), key))
+                        self.cond.notify()
+                        return
+            with self.cond:
+                del self.pending[key]
+            entry.future.set_exception(e)
+            return
+
+        with self.cond:
+            del self.pending[key]
+            now = time.monotonic()
+            self.recent = {k: v for k, v in self.recent.items() if now - v[0] < self.reuse_window}
+            self.recent[key] = (now, entry.future)
+        entry.future.set_result(result)
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_scheduler():
+    """The process-wide scheduler every weather fetch path should use."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            bucket = TokenBucket(FREE_TIER_CALLS_PER_MINUTE / 60, capacity=10)
+            _shared = RequestScheduler(bucket)
+        return _shared
+
+
+def location_params(location):
+    """Query parameters for a city name or a City (by name if it has no coordinates)."""
+    if isinstance(location, str):
+        return {'q': location}
+    if location.lat is None:
+        return {'q': location.name}
+    return {'lat': location.lat, 'lon': location.lon}
+
+
+def fetch_current_weather(location, api_key, base_url, timeout=10):
+    """Fetch current conditions in metric units.
+
+    location is a city name or a city_index.City (queried by coordinates
+    when it has them).
+    Raises urllib.error.HTTPError / URLError, json.JSONDecodeError or
+    Exception for a non-200 status, exactly as the app handled them inline.
+    """
+    params = urllib.parse.urlencode(dict(
+        location_params(location),
+        appid=api_key.strip(),
+        units='metric'  # Get temperature in Celsius directly
+    ))
+    url = f"{base_url}?{params}"
+
+    log.debug("API URL: %s", url)
+
+    # Create request with headers
+    req = urllib.request.Request(url)
+    req.add_header('User-Agent', 'WeatherApp/1.0')
+
+    with urllib.request.urlopen(req, timeout=timeout) as response:
+        if response.status != 200:
+            raise Exception(f"HTTP Error: {response.status}")
+        data = json.loads(response.read().decode())
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("API Response: %s", data)
+        return data
+
+
+def sample_weather(city):
+    """Generate sample weather data (metric units) for demonstration"""
+    weather_conditions = [
+        {'main': 'Clear', 'description': 'clear sky', 'icon': '01d'},
+        {'main': 'Clouds', 'description': 'few clouds', 'icon': '02d'},
+        {'main': 'Rain', 'description': 'light rain', 'icon': '10d'},
+        {'main': 'Snow', 'description': 'light snow', 'icon': '13d'}
+    ]
+    
+    return {
+        'name': city.title(),
+        'sys': {'country': 'XX'},
+        'weather': [random.choice(weather_conditions)],
+        'main': {
+            'temp': random.uniform(15, 30),  # Random temp between 15-30°C
+            'feels_like': random.uniform(15, 32),
+            'humidity': random.randint(40, 80),
+            'pressure': random.randint(1000, 1020)
+        },
+        'wind': {'speed': random.uniform(1, 8)},
+        'visibility': random.randint(8000, 10000)
+    }
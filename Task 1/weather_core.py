@@ -0,0 +1,154 @@
+"""
+Weather Core
+GUI-free weather lookups shared by the Tk app and the command line: city
+resolution, observation building, and concurrent fetching with retries.
+
+A WeatherService wraps a provider, a callable that returns the raw metric
+API payload for a City. The network provider goes through a
+RequestScheduler; the sample provider needs no network or API key.
+"""
+
+import logging
+import random
+import time
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from city_index import City, CityIndex
+from weather_client import (fetch_current_weather, sample_weather, shared_scheduler,
+                            PRIORITY_INTERACTIVE)
+from weather_model import parse_observation
+
+log = logging.getLogger(__name__)
+
+WEATHER_URL = "http://api.openweathermap.org/data/2.5/weather"
+
+
+class CityLookupError(LookupError):
+    """The name does not pick out one city; matches lists the cities the
+    user may have meant (possibly none)."""
+
+    def __init__(self, message, matches):
+        super().__init__(message)
+        self.matches = matches
+
+
+class AmbiguousCityError(CityLookupError):
+    """The name matches several cities in the index."""
+
+    def __init__(self, text, matches):
+        super().__init__(f"'{text}' matches several cities: "
+                         + "; ".join(city.label for city in matches), matches)
+
+
+class UnknownCityError(CityLookupError):
+    """The name is not in the full city list, so the API would not know it
+    either; matches holds spelling suggestions."""
+
+    def __init__(self, text, matches):
+        message = f"No city named '{text}'"
+        if matches:
+            message += "; did you mean " + "; ".join(city.label for city in matches)
+        super().__init__(message, matches)
+
+
+def resolve_city(cities, text):
+    """City for text: the index entry if exactly one matches. A name that
+    matches none is an unresolved City (queried by name) with the bundled
+    sample list, and raises UnknownCityError with the full list. Raises
+    AmbiguousCityError rather than guessing between several."""
+    matches = cities.lookup(text)
+    if not matches:
+        if cities.full_list:
+            raise UnknownCityError(text, cities.near(text))
+        return City.unresolved(text)
+    if len(matches) > 1:
+        raise AmbiguousCityError(text, matches)
+    return matches[0]
+
+
+def observation_for(city, data, celsius=True):
+    """Parse a payload, naming it after the index entry rather than the
+    (possibly different) weather station the API reports. Unresolved
+    cities keep the API's names."""
+    observation = parse_observation(data, celsius)
+    if city.id is None:
+        return observation
+    observation.relocate(f"{city.name}, {city.state}" if city.state else city.name, city.country)
+    observation.city_id = city.id
+    if observation.lat is None:
+        observation.lat, observation.lon = city.lat, city.lon
+    return observation
+
+
+def is_retryable(error):
+    """Server errors and network failures are worth retrying; bad keys,
+    unknown cities and malformed data are not. Rate limiting (429) is not
+    retried here either: the RequestScheduler already requeues it, and
+    retrying on top would multiply calls against the quota."""
+    if isinstance(error, urllib.error.HTTPError):
+        return error.code >= 500
+    return isinstance(error, (urllib.error.URLError, TimeoutError, ConnectionError))
+
+
+def sample_provider(city):
+    """Offline provider producing sample payloads."""
+    return sample_weather(city.name)
+
+
+class NetworkProvider:
+    """Fetch current weather through a rate-limited RequestScheduler."""
+
+    def __init__(self, api_key, base_url=WEATHER_URL, scheduler=None,
+                 priority=PRIORITY_INTERACTIVE, timeout=10):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.scheduler = scheduler or shared_scheduler()
+        self.priority = priority
+        self.timeout = timeout
+
+    def __call__(self, city):
+        future = self.scheduler.submit(
+            ('weather', city.key), fetch_current_weather,
+            city, self.api_key, self.base_url, self.timeout, priority=self.priority)
+        return future.result()
+
+
+class WeatherService:
+    """Resolve city names and fetch observations for them."""
+
+    def __init__(self, provider, cities=None, retries=2, backoff=1.0):
+        self.provider = provider
+        self.cities = cities if cities is not None else CityIndex.load()
+        self.retries = retries
+        self.backoff = backoff
+
+    def resolve(self, text):
+        return resolve_city(self.cities, text)
+
+    def fetch(self, city):
+        """Observation for city, retrying transient failures with
+        exponential backoff."""
+        attempt = 0
+        while True:
+            try:
+                return observation_for(city, self.provider(city))
+            except Exception as e:
+                if attempt >= self.retries or not is_retryable(e):
+                    raise
+                delay = self.backoff * 2 ** attempt * random.uniform(0.5, 1.5)
+                log.info("Retrying %s in %.1fs after %s", city.label, delay, e)
+                time.sleep(delay)
+                attempt += 1
+
+    def lookup(self, text):
+        return self.fetch(self.resolve(text))
+
+    def fetch_many(self, names, max_workers=8):
+        """Fetch many cities concurrently, yielding (name, observation, error)
+        as each completes. At most max_workers fetches run at once."""
+        with ThreadPoolExecutor(max_workers, thread_name_prefix="weather") as pool:
+            futures = {pool.submit(self.lookup, name): name for name in names}
+            for future in as_completed(futures):
+                error = future.exception()
+                yield futures[future], None if error else future.result(), error
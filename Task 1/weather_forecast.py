@@ -0,0 +1,221 @@
+"""
+Weather Forecast
+5-day / 3-hour forecast support: a streaming parser that turns the large
+multi-entry API response into compact columns as bytes arrive, instead of
+building the whole JSON tree first.
+
+Run this module directly to benchmark the parser without Tk:
+
+    python weather_forecast.py
+"""
+
+import codecs
+import json
+import logging
+import random
+import re
+import time
+import urllib.request
+import urllib.parse
+from array import array
+
+from weather_client import location_params
+
+log = logging.getLogger(__name__)
+
+FORECAST_URL = "http://api.openweathermap.org/data/2.5/forecast"
+
+_LIST_START = re.compile(r'"list"\s*:\s*\[')
+_CITY_START = re.compile(r'"city"\s*:\s*')
+_SKIP = re.compile(r'[\s,]*')
+
+
+class ForecastSeries:
+    """Forecast entries stored column-wise in typed arrays."""
+
+    __slots__ = ('city', 'country', 'times', 'temp_c', 'feels_like_c', 'humidity',
+                 'wind_speed', 'pop', 'precip_mm', 'condition', 'icon')
+
+    NUMERIC = ('times', 'temp_c', 'feels_like_c', 'humidity', 'wind_speed', 'pop', 'precip_mm')
+
+    def __init__(self):
+        self.city = ""
+        self.country = ""
+        self.times = array('q')
+        self.temp_c = array('d')
+        self.feels_like_c = array('d')
+        self.humidity = array('d')
+        self.wind_speed = array('d')
+        self.pop = array('d')          # probability of precipitation, 0-1
+        self.precip_mm = array('d')    # rain + snow over the 3 h slot
+        self.condition = []
+        self.icon = []
+
+    def __len__(self):
+        return len(self.times)
+
+    def append_entry(self, entry):
+        """Add one element of the API's "list" array."""
+        main = entry['main']
+        weather = entry['weather'][0]
+        self.times.append(int(entry['dt']))
+        self.temp_c.append(float(main['temp']))
+        self.feels_like_c.append(float(main['feels_like']))
+        self.humidity.append(float(main['humidity']))
+        self.wind_speed.append(float(entry['wind']['speed']))
+        self.pop.append(float(entry.get('pop', 0.0)))
+        precip = (entry.get('rain') or {}).get('3h', 0.0) + (entry.get('snow') or {}).get('3h', 0.0)
+        self.precip_mm.append(float(precip))
+        self.condition.append(weather['main'])
+        self.icon.append(weather.get('icon'))
+
+    def to_dict(self):
+        data = {name: list(getattr(self, name)) for name in self.NUMERIC}
+        data.update(city=self.city, country=self.country, condition=self.condition, icon=self.icon)
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        series = cls()
+        for name in cls.NUMERIC:
+            getattr(series, name).extend(data[name])
+        series.city = data['city']
+        series.country = data['country']
+        series.condition = list(data['condition'])
+        series.icon = list(data['icon'])
+        return series
+
+
+class ForecastParser:
+    """Incremental parser for a /forecast response.
+
+    feed() accepts raw bytes in any chunking. Each complete element of the
+    "list" array is decoded and appended to the ForecastSeries as soon as
+    its closing brace has arrived; nothing else is kept in memory.
+    """
+
+    def __init__(self):
+        self.series = ForecastSeries()
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buf = ""
+        self.state = 'head'   # head -> list -> tail
+
+    def feed(self, chunk):
+        self.buf += self.text_decoder.decode(chunk)
+        if self.state == 'head':
+            match = _LIST_START.search(self.buf)
+            if match is None:
+                return
+            self.buf = self.buf[match.end():]
+            self.state = 'list'
+        # An entry can only have completed if a closing brace arrived
+        if self.state == 'list' and (b'}' in chunk or not chunk):
+            self._parse_entries()
+
+    def _parse_entries(self):
+        buf = self.buf
+        pos = 0
+        while True:
+            pos = _SKIP.match(buf, pos).end()
+            if pos >= len(buf):
+                break
+            if buf[pos] == ']':
+                pos += 1
+                self.state = 'tail'
+                break
+            try:
+                entry, end = self.decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                break  # Entry not complete yet; wait for more bytes
+            self.series.append_entry(entry)
+            pos = end
+        self.buf = buf[pos:]
+
+    def close(self):
+        """Finish parsing and return the ForecastSeries.
+
+        Raises ValueError if the response ended inside the "list" array.
+        """
+        self.feed(b"")
+        self.buf += self.text_decoder.decode(b"", final=True)
+        if self.state != 'tail':
+            raise ValueError("Forecast response is truncated or has no 'list'")
+        match = _CITY_START.search(self.buf)
+        if match is not None:
+            try:
+                city, _ = self.decoder.raw_decode(self.buf, match.end())
+                self.series.city = city.get('name', "")
+                self.series.country = city.get('country', "")
+            except json.JSONDecodeError:
+                pass
+        self.buf = ""
+        return self.series
+
+
+def parse_forecast(chunks):
+    """Parse an iterable of byte chunks into a ForecastSeries."""
+    parser = ForecastParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser.close()
+
+
+def fetch_forecast(location, api_key, url=FORECAST_URL, timeout=10, chunk_size=16384):
+    """Fetch and stream-parse the 5-day forecast in metric units."""
+    params = urllib.parse.urlencode(dict(
+        location_params(location),
+        appid=api_key.strip(),
+        units='metric'
+    ))
+    req = urllib.request.Request(f"{url}?{params}")
+    req.add_header('User-Agent', 'WeatherApp/1.0')
+    log.debug("Forecast URL: %s?%s", url, params)
+
+    with urllib.request.urlopen(req, timeout=timeout) as response:
+        if response.status != 200:
+            raise Exception(f"HTTP Error: {response.status}")
+        return parse_forecast(iter(lambda: response.read(chunk_size), b""))
+
+
+def sample_forecast_json(city, entries=40):
+    """Generate a sample /forecast response body (bytes) for demonstration."""
+    conditions = [('Clear', '01d'), ('Clouds', '03d'), ('Rain', '10d'), ('Snow', '13d')]
+    start = int(time.time()) // 10800 * 10800
+    base = random.uniform(10, 25)
+    items = []
+    for i in range(entries):
+        main, icon = random.choice(conditions)
+        item = {
+            'dt': start + i * 10800,
+            'main': {'temp': base + 6 * random.random(), 'feels_like': base + 5 * random.random(),
+                     'humidity': random.randint(40, 90), 'pressure': random.randint(1000, 1020)},
+            'weather': [{'main': main, 'description': main.lower(), 'icon': icon}],
+            'wind': {'speed': random.uniform(1, 8)},
+            'pop': random.random(),
+        }
+        if main in ('Rain', 'Snow'):
+            item[main.lower()] = {'3h': random.uniform(0, 5)}
+        items.append(item)
+    body = {'cod': '200', 'message': 0, 'cnt': entries, 'list': items,
+            'city': {'name': city.title(), 'country': 'XX'}}
+    return json.dumps(body).encode()
+
+
+def sample_forecast(city):
+    """Sample ForecastSeries, produced through the streaming parser."""
+    body = sample_forecast_json(city)
+    return parse_forecast(body[i:i + 4096] for i in range(0, len(body), 4096))
+
+
+if __name__ == "__main__":
+    import timeit
+
+    body = sample_forecast_json("Sample")
+    runs = 500
+    streamed = timeit.timeit(lambda: parse_forecast(body[i:i + 4096] for i in range(0, len(body), 4096)),
+                             number=runs)
+    whole = timeit.timeit(lambda: json.loads(body), number=runs)
+    print(f"{len(body)} byte response, {runs} runs")
+    print(f"streaming parse into columns: {streamed / runs * 1000:.3f} ms")
+    print(f"json.loads (tree only):       {whole / runs * 1000:.3f} ms")
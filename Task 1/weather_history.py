@@ -0,0 +1,104 @@
+"""
+Weather History Store
+Append-only time series of observations per city, kept in SQLite.
+
+Raw observations are kept for RAW_RETENTION seconds, then rolled up into
+hourly averages, which in turn are rolled up into daily averages after
+HOURLY_RETENTION seconds. Queries read all three tiers and downsample in
+SQL, so a chart of months of history returns at most max_points rows.
+"""
+
+import sqlite3
+import time
+
+from weather_cache import city_key
+
+METRICS = ('temp_c', 'feels_like_c', 'humidity', 'pressure', 'wind_speed')
+
+RAW_RETENTION = 7 * 86400
+HOURLY_RETENTION = 365 * 86400
+
+# Tier table name -> bucket width in seconds (0 = raw)
+TIERS = (('observations', 0), ('hourly', 3600), ('daily', 86400))
+
+_COLUMNS = ", ".join(f"{m} REAL" for m in METRICS)
+_SCHEMA = "".join(
+    f"CREATE TABLE IF NOT EXISTS {table} (city TEXT NOT NULL, ts INTEGER NOT NULL, "
+    f"n INTEGER NOT NULL DEFAULT 1, {_COLUMNS}, PRIMARY KEY (city, ts)) WITHOUT ROWID;"
+    for table, _ in TIERS
+)
+
+
+class WeatherHistory:
+    """Time-series store of WeatherObservation metrics."""
+
+    def __init__(self, filename="weather_history.db"):
+        self.filename = filename
+        self.db = sqlite3.connect(filename, check_same_thread=False)
+        self.db.executescript(_SCHEMA)
+        self.last_rollup = 0.0
+
+    def close(self):
+        self.db.close()
+
+    def append(self, observation):
+        """Record one observation; repeats of the same timestamp are ignored."""
+        values = [city_key(observation.location_text), int(observation.observed_at)]
+        values += [getattr(observation, m) for m in METRICS]
+        with self.db:
+            self.db.execute(
+                f"INSERT OR IGNORE INTO observations (city, ts, {', '.join(METRICS)}) "
+                f"VALUES ({', '.join('?' * len(values))})", values)
+        # Rolling up is cheap but pointless more than once an hour
+        now = time.time()
+        if now - self.last_rollup > 3600:
+            self.rollup(now)
+
+    def rollup(self, now=None):
+        """Fold expired raw rows into hourly rows and old hourly rows into daily rows."""
+        now = time.time() if now is None else now
+        self.last_rollup = now
+        with self.db:
+            self._fold('observations', 'hourly', 3600, now - RAW_RETENTION)
+            self._fold('hourly', 'daily', 86400, now - HOURLY_RETENTION)
+
+    def _fold(self, source, target, width, cutoff):
+        # Weighted merge so repeated rollups into the same bucket stay exact
+        merged = ", ".join(
+            f"{m} = ({m} * n + excluded.{m} * excluded.n) / (n + excluded.n)" for m in METRICS)
+        averages = ", ".join(f"SUM({m} * n) / SUM(n)" for m in METRICS)
+        self.db.execute(
+            f"INSERT INTO {target} (city, ts, n, {', '.join(METRICS)}) "
+            f"SELECT city, (ts / {width}) * {width}, SUM(n), {averages} "
+            f"FROM {source} WHERE ts < ? GROUP BY city, ts / {width} "
+            f"ON CONFLICT (city, ts) DO UPDATE SET {merged}, n = n + excluded.n",
+            (cutoff,))
+        self.db.execute(f"DELETE FROM {source} WHERE ts < ?", (cutoff,))
+
+    def cities(self):
+        rows = self.db.execute(
+            " UNION ".join(f"SELECT DISTINCT city FROM {table}" for table, _ in TIERS))
+        return sorted(row[0] for row in rows)
+
+    def series(self, city, start, end, metrics=METRICS, max_points=500):
+        """Return (timestamps, {metric: values}) for city ("Name, CC") between
+        start and end.
+
+        Rows from all tiers are merged and averaged into at most max_points
+        equal-width time buckets.
+        """
+        span = max(1, int(end) - int(start))
+        buckets = max(1, int(max_points))
+        union = " UNION ALL ".join(
+            f"SELECT ts, n, {', '.join(metrics)} FROM {table} WHERE city = ? AND ts BETWEEN ? AND ?"
+            for table, _ in TIERS)
+        averages = ", ".join(f"SUM({m} * n) / SUM(n)" for m in metrics)
+        rows = self.db.execute(
+            f"SELECT CAST(AVG(ts) AS INTEGER), {averages} FROM ({union}) "
+            f"GROUP BY ((ts - ?) * ?) / ? ORDER BY 1",
+            [city_key(city), int(start), int(end)] * len(TIERS) + [int(start), buckets, span]
+        ).fetchall()
+
+        timestamps = [row[0] for row in rows]
+        columns = {m: [row[i + 1] for row in rows] for i, m in enumerate(metrics)}
+        return timestamps, columns
@@ -0,0 +1,201 @@
+"""
+Weather Condition Icons
+Resolve OpenWeatherMap icon codes ("10d") to images through two cache
+levels:
+
+1. IconCache - decoded PhotoImages in an in-memory LRU, one per
+   (code, scale), shared by every view in the process;
+2. IconStore - PNG bytes on disk (icon_store/), stored by SHA-256 of their
+   content with an index mapping codes to digests, so identical images are
+   kept once.
+
+Misses in the store are filled lazily from a provider: the OpenWeatherMap
+image server, or a local directory of <code>.png files (set
+WEATHER_ICON_DIR) for offline use. Fetching runs off the Tk thread;
+decoding happens on it, once per code.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+import tkinter as tk
+import urllib.request
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+log = logging.getLogger(__name__)
+
+ICON_URL = "https://openweathermap.org/img/wn/{code}@2x.png"
+# Relative to the working directory, like weather_cache.json and weather_history.db
+DEFAULT_STORE = "icon_store"
+
+
+class RemoteIconProvider:
+    """Download icons from the OpenWeatherMap image server."""
+
+    def __init__(self, url=ICON_URL, timeout=10):
+        self.url = url
+        self.timeout = timeout
+
+    def __call__(self, code):
+        req = urllib.request.Request(self.url.format(code=code))
+        req.add_header('User-Agent', 'WeatherApp/1.0')
+        with urllib.request.urlopen(req, timeout=self.timeout) as response:
+            return response.read()
+
+
+class DirectoryIconProvider:
+    """Read icons from a local directory of <code>.png (or <code>@2x.png) files."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def __call__(self, code):
+        for name in (f"{code}.png", f"{code}@2x.png"):
+            path = os.path.join(self.path, name)
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    return f.read()
+        raise FileNotFoundError(f"No icon for {code} in {self.path}")
+
+
+def default_provider():
+    path = os.environ.get("WEATHER_ICON_DIR")
+    return DirectoryIconProvider(path) if path else RemoteIconProvider()
+
+
+class IconStore:
+    """Content-addressed on-disk icon store, filled lazily from a provider.
+
+    Thread-safe; get() may block on the provider, so call it off the Tk thread.
+    """
+
+    def __init__(self, root=DEFAULT_STORE, provider=None):
+        self.root = root
+        self.provider = provider or default_provider()
+        self.index_file = os.path.join(root, "index.json")
+        self.lock = threading.Lock()
+        try:
+            with open(self.index_file, 'r') as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            self.index = {}
+
+    def _object_path(self, digest):
+        return os.path.join(self.root, "objects", digest[:2], digest[2:] + ".png")
+
+    def get(self, code):
+        """PNG bytes for code, fetching and storing them on first use."""
+        with self.lock:
+            digest = self.index.get(code)
+        if digest is not None:
+            try:
+                with open(self._object_path(digest), 'rb') as f:
+                    return f.read()
+            except OSError:
+                pass  # Object removed; fetch it again
+
+        data = self.provider(code)
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        with self.lock:
+            try:
+                if not os.path.exists(path):
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    with open(path + ".tmp", 'wb') as f:
+                        f.write(data)
+                    os.replace(path + ".tmp", path)
+                self.index[code] = digest
+                with open(self.index_file + ".tmp", 'w') as f:
+                    json.dump(self.index, f)
+                os.replace(self.index_file + ".tmp", self.index_file)
+            except OSError as e:
+                log.warning("Could not store icon %s: %s", code, e)
+        return data
+
+
+class IconCache:
+    """In-memory LRU of decoded PhotoImages backed by an IconStore.
+
+    Use from the Tk thread only. request() returns the image at once when
+    it is already decoded, otherwise loads it in the background and calls
+    the callback with it (or None on failure) on the Tk thread.
+    """
+
+    def __init__(self, root, store=None, capacity=64, max_workers=2):
+        self.root = root
+        self.store = store or IconStore()
+        self.capacity = capacity
+        self.images = OrderedDict()     # (code, scale) -> PhotoImage
+        self.waiting = {}               # code -> [(scale, callback)]
+        self.failed = set()             # Codes not to retry this session
+        self.loaded = queue.Queue()
+        self.polling = False
+        self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix="icons")
+
+    def get(self, code, scale=1):
+        """Cached image for code at 1/scale size, or None if not decoded yet."""
+        key = (code, scale)
+        image = self.images.get(key)
+        if image is not None:
+            self.images.move_to_end(key)
+            return image
+        base = self.images.get((code, 1))
+        if base is None:
+            return None
+        # Derive smaller sizes from the decoded image rather than decoding again
+        return self._remember(key, base.subsample(scale) if scale > 1 else base)
+
+    def request(self, code, callback, scale=1):
+        """Return the image for code if ready; otherwise schedule callback(image)."""
+        if not code or code in self.failed:
+            return None
+        image = self.get(code, scale)
+        if image is not None:
+            return image
+        first = code not in self.waiting
+        self.waiting.setdefault(code, []).append((scale, callback))
+        if first:
+            self.executor.submit(self._load, code)
+            if not self.polling:
+                self.polling = True
+                self.root.after(50, self._poll)
+        return None
+
+    def _load(self, code):
+        try:
+            self.loaded.put((code, self.store.get(code), None))
+        except Exception as e:
+            self.loaded.put((code, None, e))
+
+    def _poll(self):
+        while True:
+            try:
+                code, data, error = self.loaded.get_nowait()
+            except queue.Empty:
+                break
+            image = None
+            if error is None:
+                try:
+                    image = self._remember((code, 1), tk.PhotoImage(data=data))
+                except tk.TclError as e:
+                    error = e
+            if error is not None:
+                log.info("Icon %s unavailable: %s", code, error)
+                self.failed.add(code)
+            for scale, callback in self.waiting.pop(code, []):
+                callback(None if image is None else self.get(code, scale))
+        if self.waiting:
+            self.root.after(50, self._poll)
+        else:
+            self.polling = False
+
+    def _remember(self, key, image):
+        self.images[key] = image
+        self.images.move_to_end(key)
+        while len(self.images) > self.capacity:
+            self.images.popitem(last=False)
+        return image
@@ -0,0 +1,145 @@
+"""
+Weather Observation Model
+A compact, validated view of one OpenWeatherMap current-weather response.
+
+parse_observation() walks the raw JSON once, converts units and formats
+every display string into a slot, so rendering only reads attributes.
+Run this module directly to benchmark the parser without Tk:
+
+    python weather_model.py
+"""
+
+from datetime import datetime
+
+# Weather emoji mapping
+WEATHER_EMOJIS = {
+    'Clear': '☀️',
+    'Clouds': '☁️',
+    'Rain': '🌧️',
+    'Drizzle': '🌦️',
+    'Thunderstorm': '⛈️',
+    'Snow': '❄️',
+    'Mist': '🌫️',
+    'Fog': '🌫️',
+    'Haze': '🌫️'
+}
+DEFAULT_EMOJI = '🌤️'
+
+
+class ObservationError(ValueError):
+    """The API response is missing fields or has values of the wrong type."""
+
+
+class WeatherObservation:
+    """Current conditions for one city, with display units precomputed."""
+
+    FIELDS = (
+        'city', 'country', 'condition', 'description', 'icon', 'emoji',
+        'temp_c', 'temp_f', 'feels_like_c', 'humidity', 'pressure',
+        'visibility_km', 'wind_speed', 'observed_at', 'city_id', 'lat', 'lon',
+    )
+    # Display strings, formatted once from the fields above
+    TEXTS = (
+        'location_text', 'temperature_text', 'feels_like_text', 'humidity_text',
+        'pressure_text', 'visibility_text', 'wind_text',
+    )
+    __slots__ = FIELDS + TEXTS
+
+    # Fields that change on every fetch even when the weather does not
+    VOLATILE = ('observed_at',)
+
+    def __init__(self, **fields):
+        for name in self.FIELDS:
+            setattr(self, name, fields.get(name))
+        self.location_text = f"{self.city}, {self.country}"
+        self.temperature_text = f"{self.temp_c}°C / {self.temp_f}°F"
+        self.feels_like_text = f"Feels like: {self.feels_like_c}°C"
+        self.humidity_text = f"💧 Humidity: {self.humidity}%"
+        self.pressure_text = f"🌡️ Pressure: {self.pressure} hPa"
+        self.visibility_text = f"👁️ Visibility: {self.visibility_km} km"
+        self.wind_text = f"💨 Wind: {self.wind_speed} m/s"
+
+    def relocate(self, city, country):
+        """Rename the place (e.g. after the city index entry), keeping
+        location_text in step."""
+        self.city = city
+        self.country = country
+        self.location_text = f"{city}, {country}"
+
+    def __eq__(self, other):
+        if not isinstance(other, WeatherObservation):
+            return NotImplemented
+        return all(getattr(self, n) == getattr(other, n)
+                   for n in self.FIELDS if n not in self.VOLATILE)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"WeatherObservation({self.location_text!r}, {self.condition!r}, {self.temp_c}°C)"
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+
+def _number(value, path):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ObservationError(f"Expected a number for {path}, got {value!r}")
+    return value
+
+
+def parse_observation(data, celsius=True):
+    """Build a WeatherObservation from a raw API payload.
+
+    celsius says whether temperatures are already in Celsius (units=metric);
+    otherwise they are taken to be Kelvin, the API default.
+    Raises ObservationError if required fields are missing or malformed.
+    """
+    try:
+        weather = data['weather'][0]
+        main = data['main']
+        sys_info = data.get('sys') or {}
+        coord = data.get('coord') or {}
+
+        temp = _number(main['temp'], 'main.temp')
+        feels_like = _number(main['feels_like'], 'main.feels_like')
+        if not celsius:
+            temp -= 273.15
+            feels_like -= 273.15
+        temp_c = round(temp, 1)
+
+        visibility = data.get('visibility')
+        if visibility is not None:
+            visibility = _number(visibility, 'visibility') / 1000
+
+        condition = weather['main']
+        return WeatherObservation(
+            city=data['name'],
+            country=sys_info.get('country', ''),
+            condition=condition,
+            description=weather['description'].title(),
+            icon=weather.get('icon'),
+            emoji=WEATHER_EMOJIS.get(condition, DEFAULT_EMOJI),
+            temp_c=temp_c,
+            temp_f=round((temp_c * 9/5) + 32, 1),
+            feels_like_c=round(feels_like, 1),
+            humidity=_number(main['humidity'], 'main.humidity'),
+            pressure=_number(main['pressure'], 'main.pressure'),
+            visibility_km=visibility,
+            wind_speed=round(_number(data['wind']['speed'], 'wind.speed'), 1),
+            observed_at=data.get('dt') or int(datetime.now().timestamp()),
+            city_id=data.get('id'),
+            lat=coord.get('lat'),
+            lon=coord.get('lon'),
+        )
+    except (KeyError, IndexError, TypeError, AttributeError) as e:
+        raise ObservationError(f"Missing data in response: {e}") from e
+
+
+if __name__ == "__main__":
+    import timeit
+    from weather_client import sample_weather
+
+    payloads = [sample_weather(f"City {i}") for i in range(1000)]
+    runs = 20
+    seconds = timeit.timeit(lambda: [parse_observation(p) for p in payloads], number=runs)
+    print(f"parse_observation: {seconds / (runs * len(payloads)) * 1e6:.2f} µs per response")
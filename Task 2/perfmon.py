@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Performance Monitor
+Lightweight timing decorators, counters and latency histograms for the
+tkinter apps, plus Tk event-loop lag measurement and a live debug overlay.
+
+Everything is switched by the PERFMON environment variable and decided at
+import time. When it is unset, timed() returns the function untouched and
+the other helpers return immediately, so instrumented code runs at full speed.
+
+    PERFMON=1 python to-do.py
+    PERFMON=1 PERFMON_OUT=metrics.csv python "weather app.py"
+
+PERFMON_OUT names a .json or .csv file that metrics are written to on exit.
+"""
+
+import atexit
+import csv
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+ENABLED = os.environ.get("PERFMON", "") not in ("", "0")
+OUTPUT = os.environ.get("PERFMON_OUT", "")
+
+# Samples kept per histogram for percentile estimates (most recent window)
+WINDOW = 2048
+
+_lock = threading.Lock()
+_histograms = {}
+_counters = {}
+
+
+class Histogram:
+    """Running count/total/max plus a window of recent samples in seconds."""
+
+    __slots__ = ("count", "total", "max", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=WINDOW)
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        self.samples.append(value)
+
+    def summary(self):
+        ordered = sorted(self.samples)
+
+        def pick(pct):
+            return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))] if ordered else 0.0
+
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1000,
+            "mean_ms": (self.total / self.count) * 1000 if self.count else 0.0,
+            "p50_ms": pick(50) * 1000,
+            "p90_ms": pick(90) * 1000,
+            "p99_ms": pick(99) * 1000,
+            "max_ms": self.max * 1000,
+        }
+
+
+def record(name, seconds):
+    """Add one duration sample to the named histogram."""
+    if not ENABLED:
+        return
+    with _lock:
+        hist = _histograms.get(name)
+        if hist is None:
+            hist = _histograms[name] = Histogram()
+        hist.add(seconds)
+
+
+def count(name, n=1):
+    """Increment a named counter."""
+    if not ENABLED:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def timed(name=None):
+    """Decorator recording each call's duration under name (default: qualname)."""
+    def decorate(func):
+        if not ENABLED:
+            return func
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(label, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorate
+
+
+def snapshot():
+    """Return current metrics as {"timers": {...}, "counters": {...}}."""
+    with _lock:
+        return {
+            "timers": {name: hist.summary() for name, hist in sorted(_histograms.items())},
+            "counters": dict(sorted(_counters.items())),
+        }
+
+
+def export(path):
+    """Write a snapshot to path as CSV (for *.csv) or JSON."""
+    data = snapshot()
+    if path.lower().endswith(".csv"):
+        fields = ["name", "kind", "count", "total_ms", "mean_ms", "p50_ms", "p90_ms", "p99_ms", "max_ms"]
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            for name, summary in data["timers"].items():
+                writer.writerow(dict(summary, name=name, kind="timer"))
+            for name, value in data["counters"].items():
+                writer.writerow({"name": name, "kind": "counter", "count": value})
+    else:
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+
+
+def format_report():
+    """Render the snapshot as fixed-width text for the overlay."""
+    data = snapshot()
+    lines = [f"{'timer':<28}{'n':>6}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}"]
+    for name, s in data["timers"].items():
+        lines.append(f"{name[-28:]:<28}{s['count']:>6}{s['p50_ms']:>9.2f}{s['p90_ms']:>9.2f}"
+                     f"{s['p99_ms']:>9.2f}{s['max_ms']:>9.2f}")
+    if data["counters"]:
+        lines.append("")
+        lines.append("counters")
+        for name, value in data["counters"].items():
+            lines.append(f"  {name:<34}{value:>10}")
+    return "\n".join(lines)
+
+
+def watch_event_loop(root, interval_ms=50):
+    """Measure how late Tk runs a timer scheduled every interval_ms.
+
+    The lateness is recorded as "tk.loop_lag" and approximates how long the
+    event loop was blocked by other callbacks.
+    """
+    if not ENABLED:
+        return
+    interval = interval_ms / 1000
+
+    def tick(expected):
+        now = time.perf_counter()
+        record("tk.loop_lag", max(0.0, now - expected))
+        root.after(interval_ms, tick, time.perf_counter() + interval)
+
+    root.after(interval_ms, tick, time.perf_counter() + interval)
+
+
+def show_overlay(root, refresh_ms=500):
+    """Open a small always-on-top window showing live metrics."""
+    if not ENABLED:
+        return None
+    import tkinter as tk
+
+    overlay = tk.Toplevel(root)
+    overlay.title("perfmon")
+    overlay.attributes('-topmost', True)
+    overlay.protocol("WM_DELETE_WINDOW", overlay.withdraw)
+    text = tk.Label(overlay, font=('Courier', 9), justify='left', anchor='nw',
+                    bg='#1e1e1e', fg='#d4d4d4', padx=8, pady=8)
+    text.pack(fill='both', expand=True)
+
+    def refresh():
+        if overlay.winfo_viewable():
+            text.config(text=format_report())
+        overlay.after(refresh_ms, refresh)
+
+    refresh()
+    return overlay
+
+
+def install(root):
+    """Enable loop-lag sampling and the overlay for a Tk root."""
+    if not ENABLED:
+        return
+    watch_event_loop(root)
+    show_overlay(root)
+
+
+if ENABLED and OUTPUT:
+    atexit.register(export, OUTPUT)
@@ -0,0 +1,139 @@
+"""
+Tests for todo_reminders: one timer is armed for the earliest due task,
+reschedules and cancels move it, and rebuilding from the task list never
+repeats or drops a reminder.
+
+Run with:  python -m unittest test_todo_reminders   (or: python -m pytest)
+"""
+
+import unittest
+from datetime import datetime
+
+from todo_core import TIME_FORMAT
+from todo_reminders import ReminderScheduler, MAX_DELAY_MS
+
+START = datetime(2030, 1, 1, 9, 0).timestamp()
+
+
+class FakeTk:
+    """after()/after_cancel() pair driven by a fake clock."""
+
+    def __init__(self):
+        self.now = START
+        self.timers = {}   # handle -> (due time, callback)
+        self.handles = 0
+
+    def clock(self):
+        return self.now
+
+    def after(self, delay_ms, callback):
+        self.handles += 1
+        self.timers[self.handles] = (self.now + delay_ms / 1000, callback)
+        return self.handles
+
+    def after_cancel(self, handle):
+        del self.timers[handle]
+
+    def advance(self, seconds):
+        """Move the clock on, running timers as they come due."""
+        target = self.now + seconds
+        while True:
+            ready = [(when, handle) for handle, (when, _) in self.timers.items() if when <= target]
+            if not ready:
+                break
+            when, handle = min(ready)
+            self.now = max(self.now, when)
+            _, callback = self.timers.pop(handle)
+            callback()
+        self.now = target
+
+
+def task(task_id, minutes, completed=False):
+    """A task due the given number of minutes after START."""
+    due = datetime.fromtimestamp(START + minutes * 60).strftime(TIME_FORMAT)
+    return {"id": task_id, "description": f"task {task_id}", "due": due, "completed": completed}
+
+
+class ReminderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tk = FakeTk()
+        self.reminded = []
+        self.scheduler = ReminderScheduler(self.tk.after, self.tk.after_cancel,
+                                           self.reminded.append, clock=self.tk.clock)
+
+    def armed(self):
+        """Due times of the pending timers."""
+        return sorted(when for when, _ in self.tk.timers.values())
+
+    def test_single_timer_for_the_earliest_task(self):
+        self.scheduler.reset([task(1, 30), task(2, 10), task(3, 20), task(4, 5, completed=True),
+                              {"id": 5, "description": "no due date", "completed": False}])
+        self.assertEqual(len(self.scheduler), 3)
+        self.assertEqual(self.armed(), [START + 600])
+        self.tk.advance(25 * 60)
+        self.assertEqual(self.reminded, [2, 3])
+        self.assertEqual(self.armed(), [START + 1800])
+
+    def test_tasks_due_together_fire_together(self):
+        self.scheduler.reset([task(1, 10), task(2, 10)])
+        self.tk.advance(10 * 60)
+        self.assertEqual(sorted(self.reminded), [1, 2])
+        self.assertEqual(self.armed(), [])
+
+    def test_reschedule_and_cancel_move_the_timer(self):
+        self.scheduler.reset([task(1, 10), task(2, 20)])
+        self.scheduler.schedule(task(1, 30))
+        self.assertEqual(self.armed(), [START + 1200])
+        self.scheduler.cancel(2)
+        self.assertEqual(self.armed(), [START + 1800])
+        self.scheduler.schedule(task(1, 30, completed=True))
+        self.assertEqual(self.armed(), [])
+        self.tk.advance(3600)
+        self.assertEqual(self.reminded, [])
+
+    def test_stale_entries_are_compacted(self):
+        self.scheduler.schedule(task(1, 10))
+        for minutes in range(11, 200):
+            self.scheduler.schedule(task(1, minutes))
+        self.assertLessEqual(len(self.scheduler.heap), 2 * len(self.scheduler) + 64)
+        self.tk.advance(200 * 60)
+        self.assertEqual(self.reminded, [1])
+
+    def test_distant_due_time_rearms_daily(self):
+        self.scheduler.schedule(task(1, 3 * 24 * 60))
+        self.assertEqual(self.armed(), [START + MAX_DELAY_MS / 1000])
+        self.tk.advance(2 * 24 * 3600)
+        self.assertEqual(self.reminded, [])
+        self.assertEqual(self.armed(), [START + 3 * 24 * 3600])
+        self.tk.advance(24 * 3600)
+        self.assertEqual(self.reminded, [1])
+
+    def test_reset_does_not_repeat_delivered_reminders(self):
+        tasks = [task(1, 10), task(2, 20)]
+        self.scheduler.reset(tasks)
+        self.tk.advance(15 * 60)
+        self.scheduler.reset(tasks)
+        self.scheduler.schedule(tasks[0])
+        self.tk.advance(3600)
+        self.assertEqual(self.reminded, [1, 2])
+
+    def test_reset_keeps_reminders_whose_timer_has_not_run(self):
+        # The deadline passes while the event loop is busy; a reset that
+        # runs before the timer callback must not lose the reminder
+        self.scheduler.reset([task(1, 10)])
+        self.tk.now = START + 11 * 60
+        self.scheduler.reset([task(1, 10)])
+        self.tk.advance(0)
+        self.assertEqual(self.reminded, [1])
+
+    def test_moved_due_time_reminds_again(self):
+        self.scheduler.reset([task(1, 10)])
+        self.tk.advance(15 * 60)
+        self.scheduler.reset([task(1, 30)])
+        self.tk.advance(3600)
+        self.assertEqual(self.reminded, [1, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+Tests for todo_search: typos and transpositions find their tasks, the
+bit-parallel edit distance agrees with the textbook recurrence, and the
+index stays correct as tasks change.
+
+Run with:  python -m unittest test_todo_search   (or: python -m pytest)
+"""
+
+import itertools
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from todo_core import TaskStore
+from todo_search import FuzzyIndex, edit_distance
+
+
+def reference_distance(a, b):
+    """Optimal string alignment distance by dynamic programming."""
+    d = [[i + j if i * j == 0 else 0 for j in range(len(b) + 1)] for i in range(len(a) + 1)]
+    for i, j in itertools.product(range(1, len(a) + 1), range(1, len(b) + 1)):
+        d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1, d[i - 1][j - 1] + (a[i - 1] != b[j - 1]))
+        if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+            d[i][j] = min(d[i][j], d[i - 2][j - 2] + 1)
+    return d[-1][-1]
+
+
+def index_of(*descriptions):
+    return FuzzyIndex({"id": i, "description": text} for i, text in enumerate(descriptions, 1))
+
+
+class EditDistanceTest(unittest.TestCase):
+
+    def test_transposition_is_one_edit(self):
+        self.assertEqual(edit_distance("mlik", "milk"), 1)
+        self.assertEqual(edit_distance("reoprt", "report"), 1)
+        self.assertEqual(edit_distance("act", "cat"), 1)
+
+    def test_matches_reference(self):
+        rng = random.Random(7)
+        for _ in range(3000):
+            a = "".join(rng.choice("abc") for _ in range(rng.randint(0, 7)))
+            b = "".join(rng.choice("abc") for _ in range(rng.randint(0, 7)))
+            self.assertEqual(edit_distance(a, b), reference_distance(a, b), (a, b))
+
+
+class SearchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = index_of("Buy milk", "Write quarterly report", "Call mom", "Feed the cat")
+
+    def ids(self, query, **kwargs):
+        return [task_id for _, task_id in self.index.search(query, **kwargs)]
+
+    def test_typos_and_transpositions(self):
+        for query, expected in (("mlik", 1), ("milkk", 1), ("reprot", 2), ("reoprt", 2),
+                                ("qurterly", 2), ("act", 4), ("buy mlik", 1)):
+            self.assertEqual(self.ids(query)[:1], [expected], query)
+
+    def test_unrelated_query_finds_nothing(self):
+        self.assertEqual(self.ids("xyzzy"), [])
+
+    def test_all_words_beat_some_words(self):
+        index = index_of("buy bread", "buy milk", "milk the cow")
+        self.assertEqual([task_id for _, task_id in index.search("buy mlik")][0], 2)
+
+    def test_limit_and_ties_by_id(self):
+        index = index_of(*["item"] * 10)
+        self.assertEqual([task_id for _, task_id in index.search("itme", limit=3)], [1, 2, 3])
+
+    def test_add_and_remove_keep_index_current(self):
+        self.index.add(5, "Renew passport")
+        self.assertEqual(self.ids("pasport"), [5])
+        self.index.add(5, "Renew licence")
+        self.assertEqual(self.ids("pasport"), [])
+        self.index.remove(5)
+        self.assertEqual(self.ids("licence"), [])
+        self.assertNotIn("licence", self.index.word_tasks)
+
+    def test_early_stop_returns_the_true_top(self):
+        rng = random.Random(3)
+        vocabulary = ["item%d" % n for n in range(2000)] + ["milk", "report", "call", "mom"]
+        texts = [" ".join(rng.sample(vocabulary, 3)) for _ in range(3000)]
+        index = index_of(*texts)
+        for query in ("item15", "mlik", "reprot item7", "item1234"):
+            # With room for every task nothing can stop the search early
+            expected = index.search(query, limit=len(texts))[:10]
+            self.assertEqual(index.search(query, limit=10), expected, query)
+
+
+class StoreIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp(prefix="todo-search-")
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.store = TaskStore(os.path.join(self.dir, "tasks.json"))
+
+    def test_background_build_replays_changes(self):
+        for n in range(2000):
+            self.store.add(f"task number {n}")
+        self.store.build_index()
+        added = self.store.add("Buy milk")
+        self.store.delete(1)
+        results = self.store.fuzzy_search("mlik")
+        self.assertEqual([t["id"] for t in results], [added["id"]])
+        self.assertNotIn(1, self.store._index.task_words)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,215 @@
+"""
+Tests for todo_sync: replicas converge whatever order they sync in,
+deletes win over concurrent edits, and the server journal survives a
+restart.
+
+Run with:  python -m unittest test_todo_sync   (or: python -m pytest)
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+import todo_sync
+from todo_core import TaskStore, SYNC_FIELDS
+
+
+class LocalClient:
+    """In-process stand-in for SyncClient that still round-trips JSON."""
+
+    def __init__(self, log):
+        self.log = log
+
+    def exchange(self, request):
+        body = json.dumps(request)
+        data = json.dumps(self.log.exchange(**json.loads(body)))
+        return json.loads(data), len(body), len(data)
+
+
+def snapshot(store):
+    """Replicated content of a store, independent of local task IDs."""
+    return {t["uid"]: {f: t.get(f) for f in SYNC_FIELDS} for t in store.tasks}
+
+
+class SyncTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp(prefix="todo-sync-")
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.log = todo_sync.SyncLog(self.path("sync.ndjson"))
+        self.addCleanup(self.log.close)
+        self.client = LocalClient(self.log)
+
+    def path(self, name):
+        return os.path.join(self.dir, name)
+
+    def store(self, name):
+        return TaskStore(self.path(name))
+
+    def sync(self, *stores, client=None):
+        for store in stores:
+            todo_sync.sync(store, client or self.client)
+
+    def fresh(self, name):
+        """A separate sync log and a store factory in their own subdirectory,
+        for tests that repeat a scenario."""
+        root = os.path.join(self.dir, name)
+        os.mkdir(root)
+        log = todo_sync.SyncLog(os.path.join(root, "sync.ndjson"))
+        self.addCleanup(log.close)
+        return LocalClient(log), lambda store: TaskStore(os.path.join(root, store))
+
+    def assertConverged(self, *stores):
+        first = snapshot(stores[0])
+        for store in stores[1:]:
+            self.assertEqual(snapshot(store), first)
+
+
+class ConvergenceTest(SyncTestCase):
+
+    def test_concurrent_edits_converge_in_any_sync_order(self):
+        a, b, c = self.store("a.json"), self.store("b.json"), self.store("c.json")
+        a.add("buy milk", "high")
+        a.add("write report", "low")
+        self.sync(a, b, c)
+
+        # Concurrent edits: different fields of one task, and the same field
+        milk_b = next(t for t in b.tasks if t["description"] == "buy milk")
+        milk_c = next(t for t in c.tasks if t["description"] == "buy milk")
+        b.complete(milk_b["id"])
+        b.set_due(milk_b["id"], "2030-01-01")
+        c.set_due(milk_c["id"], "2031-06-30")
+        c.add("call mom")
+        a.add("water plants")
+
+        self.sync(c, a, b)
+        self.sync(b, c, a)
+        self.assertConverged(a, b, c)
+
+        milk = next(t for t in a.tasks if t["description"] == "buy milk")
+        self.assertTrue(milk["completed"])
+        self.assertEqual(len(a.tasks), 4)
+        for store in (a, b, c):
+            self.assertEqual(store.unpushed, {})
+
+    def test_same_field_conflict_converges_in_every_order(self):
+        for order in ((0, 1, 2), (2, 1, 0), (1, 2, 0)):
+            with self.subTest(order=order):
+                client, store = self.fresh("".join(map(str, order)))
+                stores = [store(f"{n}.json") for n in "abc"]
+                stores[0].add("shared task")
+                self.sync(*stores, client=client)
+                for replica, due in zip(stores, ("2030-01-01", "2030-02-01", "2030-03-01")):
+                    replica.set_due(replica.tasks[0]["id"], due)
+                for _ in range(2):
+                    self.sync(*(stores[i] for i in order), client=client)
+                self.assertConverged(*stores)
+                self.assertIn(stores[0].tasks[0]["due"][:10], ("2030-01-01", "2030-02-01", "2030-03-01"))
+
+    def test_pulled_tasks_keep_creation_order(self):
+        a, b = self.store("a.json"), self.store("b.json")
+        for n in range(5):
+            a.add(f"task {n}")
+        self.sync(a, b)
+        self.assertEqual([t["description"] for t in sorted(b.tasks, key=lambda t: t["id"])],
+                         [f"task {n}" for n in range(5)])
+
+    def test_legacy_copies_do_not_duplicate(self):
+        legacy = [{"id": 1, "description": "buy milk", "priority": "high",
+                   "completed": False, "created": "2024-01-01 10:00:00"}]
+        for name in ("a.json", "b.json"):
+            with open(self.path(name), 'w') as f:
+                json.dump(legacy, f)
+        a, b = self.store("a.json"), self.store("b.json")
+        self.sync(a, b, a)
+        self.assertEqual(len(a.tasks), 1)
+        self.assertEqual(len(b.tasks), 1)
+        self.assertConverged(a, b)
+
+
+class DeleteTest(SyncTestCase):
+
+    def test_delete_wins_over_concurrent_edit(self):
+        for deleter_first in (True, False):
+            with self.subTest(deleter_first=deleter_first):
+                client, store = self.fresh(f"deleter-first-{deleter_first}")
+                a, b = store("a.json"), store("b.json")
+                task = a.add("obsolete")
+                self.sync(a, b, client=client)
+                a.delete(task["id"])
+                b.complete(b.tasks[0]["id"])
+                self.sync(*((a, b, a) if deleter_first else (b, a, b)), client=client)
+                self.assertEqual(a.tasks, [])
+                self.assertEqual(b.tasks, [])
+                self.assertIn(task["uid"], a.tombstones)
+                self.assertIn(task["uid"], b.tombstones)
+
+    def test_tombstone_blocks_late_edit(self):
+        a = self.store("a.json")
+        task = a.add("gone")
+        self.sync(a)
+        a.delete(task["id"])
+        self.sync(a)
+        late = {task["uid"]: {"completed": [True, [999, "zzz"]]}}
+        self.assertEqual(self.log.merge(task["uid"], late[task["uid"]]), {})
+        self.assertFalse(a.apply_remote(task["uid"], late[task["uid"]]))
+        self.assertEqual(a.tasks, [])
+
+
+class JournalTest(SyncTestCase):
+
+    def test_replay_restores_state(self):
+        a = self.store("a.json")
+        keep = a.add("keep")
+        drop = a.add("drop")
+        self.sync(a)
+        a.complete(keep["id"])
+        a.delete(drop["id"])
+        self.sync(a)
+        self.log.close()
+
+        restarted = todo_sync.SyncLog(self.path("sync.ndjson"))
+        self.addCleanup(restarted.close)
+        self.assertEqual(restarted.seq, self.log.seq)
+        self.assertEqual(restarted.state, self.log.state)
+        self.assertEqual(list(restarted.order), list(self.log.order))
+
+        fresh = self.store("fresh.json")
+        todo_sync.sync(fresh, LocalClient(restarted))
+        self.assertEqual([(t["description"], t["completed"]) for t in fresh.tasks], [("keep", True)])
+
+    def test_torn_last_line_is_ignored(self):
+        a = self.store("a.json")
+        a.add("survives")
+        self.sync(a)
+        self.log.close()
+        with open(self.path("sync.ndjson"), 'a') as f:
+            f.write('["partial", {"descr')
+        restarted = todo_sync.SyncLog(self.path("sync.ndjson"))
+        self.addCleanup(restarted.close)
+        self.assertEqual(restarted.state, self.log.state)
+
+
+class HttpTest(SyncTestCase):
+
+    def test_round_trip_over_http(self):
+        server = todo_sync.SyncServer(("127.0.0.1", 0), self.log)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        client = todo_sync.SyncClient(f"http://127.0.0.1:{server.server_port}")
+        self.addCleanup(client.close)
+
+        a, b = self.store("a.json"), self.store("b.json")
+        a.add("over the wire")
+        self.assertEqual(todo_sync.sync(a, client)["pushed"], 1)
+        self.assertEqual(todo_sync.sync(b, client)["pulled"], 1)
+        self.assertConverged(a, b)
+
+
+if __name__ == "__main__":
+    unittest.main()
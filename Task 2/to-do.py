@@ -2,32 +2,174 @@
 """
 GUI To-Do List Application
 A comprehensive task management system with tkinter GUI and file persistence.
+
+Set TODO_API_PORT to also serve the open task list as the todo_server JSON
+API. The server runs inside the GUI on the same store, so API and GUI edits
+never overwrite each other (a separate todo_server.py process would).
 """
 
-# Test tkinter availability
-try:
-    import tkinter as tk
-    print("✅ Tkinter imported successfully")
-except ImportError as e:
-    print(f"❌ Error importing tkinter: {e}")
-    print("Please install tkinter or use a Python version with tkinter included")
-    exit(1)
-from tkinter import ttk, messagebox, simpledialog
-import json
 import os
-from datetime import datetime
+import sys
+import threading
 from typing import List, Dict
 
+import perfmon
+from todo_core import TaskStore, FILTERS, format_stats, now_str
+from todo_reminders import ReminderScheduler
+
+# How often the GUI checks for changes made through the embedded API
+API_POLL_MS = 500
+
+# tkinter is imported lazily by load_tkinter() so that importing this module
+# (or the task core) does not require a display or pay GUI startup cost.
+tk = ttk = messagebox = simpledialog = None
+
+
+def load_tkinter():
+    """Import tkinter modules into this module's namespace on first use."""
+    global tk, ttk, messagebox, simpledialog
+    if tk is None:
+        import tkinter
+        from tkinter import ttk as _ttk, messagebox as _messagebox, simpledialog as _simpledialog
+        tk, ttk, messagebox, simpledialog = tkinter, _ttk, _messagebox, _simpledialog
+
+
+def task_row(task, columns, now=None):
+    """Build a (iid, values, tags) row for a task, limited to the given columns.
+    
+    now (a TIME_FORMAT string) marks past-due pending tasks as overdue.
+    """
+    status = "✅ Done" if task["completed"] else "⏳ Pending"
+    due = task.get("due")
+    cells = {
+        'ID': task["id"],
+        'Status': status,
+        'Priority': task["priority"].title(),
+        'Description': task["description"],
+        'Created': task["created"].split()[0],  # Show only date
+        'Due': due[:16] if due else "",  # Without seconds
+    }
+    
+    # Color coding based on priority and status
+    if task["completed"]:
+        tags = ("completed",)
+    elif due and now and due < now:
+        tags = ("overdue",)
+    elif task["priority"] == "high":
+        tags = ("high_priority",)
+    else:
+        tags = ()
+    
+    return str(task["id"]), tuple(cells[c] for c in columns), tags
+
+
+class TreeRows:
+    """Keeps a Treeview in step with a list of rows, touching only what changed.
+    
+    Rows are (iid, values, tags) tuples. Unchanged rows are left alone,
+    changed rows are updated in place and only new or vanished rows are
+    inserted or deleted, so refreshing after a single edit costs a single
+    item update instead of rebuilding every row.
+    """
+    
+    def __init__(self, tree):
+        self.tree = tree
+        self.rows = {}
+        self.order = []
+    
+    def update(self, rows):
+        tree = self.tree
+        new_order = [iid for iid, _, _ in rows]
+        keep = set(new_order)
+        
+        stale = [iid for iid in self.order if iid not in keep]
+        if stale:
+            tree.delete(*stale)
+        
+        old_rows = self.rows
+        new_rows = {}
+        added = []
+        for iid, values, tags in rows:
+            row = (values, tags)
+            previous = old_rows.get(iid)
+            if previous is None:
+                tree.insert('', 'end', iid=iid, values=values, tags=tags)
+                added.append(iid)
+            elif previous != row:
+                tree.item(iid, values=values, tags=tags)
+            new_rows[iid] = row
+        
+        # Kept rows are still in their old order with new ones appended;
+        # move only from the first position that differs from the target.
+        current = [iid for iid in self.order if iid in keep] + added
+        for index, iid in enumerate(new_order):
+            if current[index] != iid:
+                for offset, moved in enumerate(new_order[index:]):
+                    tree.move(moved, '', index + offset)
+                break
+        
+        self.rows = new_rows
+        self.order = new_order
+        perfmon.count("todo.rows_changed", len(stale) + len(added))
+
+
+class DialogPool:
+    """Creates each named dialog once and reuses it afterwards.
+    
+    Closing a pooled window only hides it; the next request re-populates the
+    existing widgets in place instead of building a new Toplevel.
+    """
+    
+    def __init__(self, root):
+        self.root = root
+        self.windows = {}
+    
+    def get(self, key, build):
+        """Return the window for key, calling build(window) the first time."""
+        window = self.windows.get(key)
+        if window is None or not window.winfo_exists():
+            window = tk.Toplevel(self.root)
+            window.protocol("WM_DELETE_WINDOW", window.withdraw)
+            build(window)
+            self.windows[key] = window
+            perfmon.count("todo.dialogs_built")
+        return window
+    
+    @staticmethod
+    def show(window):
+        window.deiconify()
+        window.lift()
+        window.focus_set()
+
 class TodoGUI:
     def __init__(self):
+        load_tkinter()
         self.filename = "tasks.json"
-        self.tasks = self.load_tasks()
+        self.store = TaskStore(self.filename)
+        
+        # Optional replica sync (python todo_sync.py serve)
+        self.sync_url = os.environ.get("TODO_SYNC_URL")
+        self.sync_client = None
+        self.sync_thread = None
+        
+        # Optional embedded JSON API on this store (see todo_server)
+        self.api_port = os.environ.get("TODO_API_PORT")
+        self.service = None
+        self.api_server = None
+        # Guards the store against the API threads; uncontended without them
+        self.lock = threading.RLock()
+        self.shown_version = None
         
         # Create main window
         self.root = tk.Tk()
         self.root.title("📝 Personal To-Do List Manager")
         self.root.geometry("900x700")
         self.root.configure(bg='#f0f0f0')
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+        self.dialogs = DialogPool(self.root)
+        
+        # One root.after timer for the next due task
+        self.reminders = ReminderScheduler(self.root.after, self.root.after_cancel, self.remind)
         
         # Configure styles
         self.setup_styles()
@@ -40,6 +182,48 @@ class TodoGUI:
         
         # Update statistics
         self.update_stats()
+        
+        # Arm reminders for pending tasks with due dates
+        self.reminders.reset(self.store.tasks)
+        
+        # Index descriptions for fuzzy search without holding up the UI
+        self.store.build_index()
+        
+        if self.api_port:
+            self.start_api(int(self.api_port))
+    
+    def start_api(self, port):
+        """Serve self.store over HTTP from background threads."""
+        from todo_server import TaskService, TaskServer
+        service = TaskService(self.store)
+        try:
+            self.api_server = TaskServer(("127.0.0.1", port), service)
+        except OSError as e:
+            service.close()
+            messagebox.showwarning("Warning", f"Could not start the API on port {port}: {e}")
+            return
+        self.service = service
+        self.lock = service.lock
+        threading.Thread(target=self.api_server.serve_forever, name="todo-api", daemon=True).start()
+        print(f"Serving tasks on http://127.0.0.1:{self.api_server.server_port}")
+        self.root.after(API_POLL_MS, self.poll_api)
+    
+    def poll_api(self):
+        """Show changes made through the API since the list was last drawn."""
+        if self.store.version != self.shown_version:
+            self.refresh_task_list()
+            self.update_stats()
+            with self.lock:
+                self.reminders.reset(self.store.tasks)
+        self.root.after(API_POLL_MS, self.poll_api)
+    
+    def close(self):
+        """Stop the embedded API (saving its pending writes) and exit."""
+        if self.api_server is not None:
+            self.api_server.shutdown()
+            self.api_server.server_close()
+            self.service.close()
+        self.root.destroy()
     
     def setup_styles(self):
         """Configure ttk styles for better appearance."""
@@ -105,6 +289,11 @@ class TodoGUI:
             ttk.Radiobutton(priority_frame, text=text, variable=self.priority_var, 
                            value=value).pack(side='left', padx=(0, 10))
         
+        # Optional due date
+        ttk.Label(add_frame, text="Due (YYYY-MM-DD [HH:MM], optional):").pack(anchor='w')
+        self.due_var = tk.StringVar()
+        ttk.Entry(add_frame, textvariable=self.due_var).pack(fill='x', pady=(2, 10))
+        
         # Add button
         ttk.Button(add_frame, text="➕ Add Task", command=self.add_task,
                   style='Accent.TButton').pack(fill='x')
@@ -117,9 +306,12 @@ class TodoGUI:
         buttons = [
             ("✅ Complete Task", self.complete_task),
             ("❌ Delete Task", self.delete_task),
+            ("📅 Set Due Date", self.set_due_date),
             ("🔍 Search Tasks", self.search_tasks),
             ("🔄 Refresh List", self.refresh_task_list),
         ]
+        if self.sync_url:
+            buttons.append(("⇅ Sync", self.sync_tasks))
         
         for text, command in buttons:
             ttk.Button(control_frame, text=text, command=command).pack(fill='x', pady=2)
@@ -141,7 +333,7 @@ class TodoGUI:
         ttk.Label(filter_frame, text="Filter:", style='Heading.TLabel').pack(side='left')
         
         self.filter_var = tk.StringVar(value="All")
-        filter_options = ["All", "Pending", "Completed", "High Priority"]
+        filter_options = list(FILTERS)
         filter_combo = ttk.Combobox(filter_frame, textvariable=self.filter_var, 
                                    values=filter_options, state='readonly', width=15)
         filter_combo.pack(side='left', padx=(10, 0))
@@ -156,7 +348,7 @@ class TodoGUI:
         tree_frame.pack(fill='both', expand=True)
         
         # Treeview
-        columns = ('ID', 'Status', 'Priority', 'Description', 'Created')
+        columns = ('ID', 'Status', 'Priority', 'Description', 'Created', 'Due')
         self.task_tree = ttk.Treeview(tree_frame, columns=columns, show='headings',
                                      style='Custom.Treeview')
         
@@ -166,12 +358,14 @@ class TodoGUI:
         self.task_tree.heading('Priority', text='Priority')
         self.task_tree.heading('Description', text='Description')
         self.task_tree.heading('Created', text='Created')
+        self.task_tree.heading('Due', text='Due')
         
         self.task_tree.column('ID', width=50, anchor='center')
         self.task_tree.column('Status', width=80, anchor='center')
         self.task_tree.column('Priority', width=80, anchor='center')
         self.task_tree.column('Description', width=300, anchor='w')
-        self.task_tree.column('Created', width=150, anchor='center')
+        self.task_tree.column('Created', width=100, anchor='center')
+        self.task_tree.column('Due', width=120, anchor='center')
         
         # Scrollbars
         v_scrollbar = ttk.Scrollbar(tree_frame, orient='vertical', command=self.task_tree.yview)
@@ -184,24 +378,33 @@ class TodoGUI:
         v_scrollbar.pack(side='right', fill='y')
         h_scrollbar.pack(side='bottom', fill='x')
         
+        # Configure tags for color coding
+        self.task_tree.tag_configure("completed", foreground="gray")
+        self.task_tree.tag_configure("overdue", foreground="#c0392b")
+        self.task_tree.tag_configure("high_priority", foreground="red", font=('Arial', 10, 'bold'))
+        self.task_rows = TreeRows(self.task_tree)
+        
         # Bind double-click event
         self.task_tree.bind('<Double-1>', self.on_task_double_click)
     
+    @property
+    def tasks(self) -> List[Dict]:
+        """Tasks held by the underlying store."""
+        return self.store.tasks
+    
     def load_tasks(self) -> List[Dict]:
         """Load tasks from JSON file."""
-        try:
-            if os.path.exists(self.filename):
-                with open(self.filename, 'r') as f:
-                    return json.load(f)
-            return []
-        except (json.JSONDecodeError, FileNotFoundError):
-            return []
+        with self.lock:
+            tasks = self.store.load()
+            self.reminders.reset(tasks)
+            self.store.build_index()
+        return tasks
     
     def save_tasks(self):
         """Save tasks to JSON file."""
         try:
-            with open(self.filename, 'w') as f:
-                json.dump(self.tasks, f, indent=2)
+            with self.lock:
+                self.store.save()
         except Exception as e:
             messagebox.showerror("Error", f"Could not save tasks: {e}")
     
@@ -213,19 +416,18 @@ class TodoGUI:
             messagebox.showwarning("Warning", "Please enter a task description!")
             return
         
-        task = {
-            "id": max([t.get("id", 0) for t in self.tasks], default=0) + 1,
-            "description": description,
-            "priority": self.priority_var.get().lower(),
-            "completed": False,
-            "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
-        
-        self.tasks.append(task)
+        try:
+            with self.lock:
+                task = self.store.add(description, self.priority_var.get(), self.due_var.get())
+        except ValueError as e:
+            messagebox.showwarning("Warning", str(e))
+            return
         self.save_tasks()
+        self.reminders.schedule(task)
         
         # Clear entry and refresh
         self.task_entry.delete("1.0", tk.END)
+        self.due_var.set("")
         self.refresh_task_list()
         self.update_stats()
         
@@ -241,20 +443,20 @@ class TodoGUI:
         item = self.task_tree.item(selected[0])
         task_id = int(item['values'][0])
         
-        for task in self.tasks:
-            if task["id"] == task_id:
-                if task["completed"]:
-                    messagebox.showinfo("Info", "Task is already completed!")
-                    return
-                
-                task["completed"] = True
-                task["completed_date"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                self.save_tasks()
-                self.refresh_task_list()
-                self.update_stats()
-                
-                messagebox.showinfo("Success", f"Task completed successfully!")
+        with self.lock:
+            if self.store.get(task_id) is None:
                 return
+            changed = self.store.complete(task_id)
+        if not changed:
+            messagebox.showinfo("Info", "Task is already completed!")
+            return
+        
+        self.reminders.cancel(task_id)
+        self.save_tasks()
+        self.refresh_task_list()
+        self.update_stats()
+        
+        messagebox.showinfo("Success", f"Task completed successfully!")
     
     def delete_task(self):
         """Delete selected task."""
@@ -270,13 +472,101 @@ class TodoGUI:
         if messagebox.askyesno("Confirm Delete", 
                               f"Are you sure you want to delete:\n'{task_desc[:50]}...'?"):
             
-            self.tasks = [t for t in self.tasks if t["id"] != task_id]
+            with self.lock:
+                if self.store.get(task_id) is not None:
+                    self.store.delete(task_id)
+            self.reminders.cancel(task_id)
             self.save_tasks()
             self.refresh_task_list()
             self.update_stats()
             
             messagebox.showinfo("Success", "Task deleted successfully!")
     
+    def set_due_date(self):
+        """Set or clear the due date of the selected task."""
+        selected = self.task_tree.selection()
+        if not selected:
+            messagebox.showwarning("Warning", "Please select a task to set a due date for!")
+            return
+        
+        task = self.store.get(int(self.task_tree.item(selected[0])['values'][0]))
+        if task is None:
+            return
+        
+        due = simpledialog.askstring("Due Date", "Due (YYYY-MM-DD [HH:MM]); leave empty to clear:",
+                                     initialvalue=(task.get("due") or "")[:16], parent=self.root)
+        if due is None:
+            return
+        try:
+            with self.lock:
+                self.store.set_due(task["id"], due)
+        except KeyError:
+            return  # Deleted through the API meanwhile
+        except ValueError as e:
+            messagebox.showwarning("Warning", str(e))
+            return
+        
+        self.reminders.schedule(task)
+        self.save_tasks()
+        self.refresh_task_list()
+        self.update_stats()
+    
+    def remind(self, task_id):
+        """Called by the reminder scheduler when a task falls due."""
+        task = self.store.get(task_id)
+        if task is None or task["completed"]:
+            return
+        self.refresh_task_list()
+        self.update_stats()
+        messagebox.showinfo("⏰ Reminder", f"Task {task_id} is due now:\n{task['description'][:100]}")
+    
+    def sync_tasks(self):
+        """Exchange changes with the sync server without blocking the UI.
+
+        The request is built and the response applied on the Tk thread; only
+        the HTTP round trip runs in the background.
+        """
+        if self.sync_thread is not None:
+            return
+        from todo_sync import SyncClient, prepare
+        if self.sync_client is None:
+            self.sync_client = SyncClient(self.sync_url)
+        with self.lock:
+            request, pushed = prepare(self.store)
+        result = {}
+        
+        def exchange():
+            try:
+                result["response"] = self.sync_client.exchange(request)
+            except Exception as e:
+                result["error"] = e
+        
+        self.sync_thread = threading.Thread(target=exchange, name="todo-sync", daemon=True)
+        self.sync_thread.start()
+        self.root.after(50, self.finish_sync, pushed, result)
+    
+    def finish_sync(self, pushed, result):
+        if self.sync_thread.is_alive():
+            self.root.after(50, self.finish_sync, pushed, result)
+            return
+        self.sync_thread = None
+        if "error" in result:
+            messagebox.showerror("Sync Error", f"Could not sync: {result['error']}")
+            return
+        
+        from todo_sync import finish
+        response, sent, received = result["response"]
+        with self.lock:
+            pulled = finish(self.store, pushed, response)
+        self.save_tasks()
+        if pulled:
+            self.refresh_task_list()
+            self.update_stats()
+            with self.lock:
+                self.reminders.reset(self.store.tasks)
+        perfmon.count("todo.sync_bytes_sent", sent)
+        perfmon.count("todo.sync_bytes_received", received)
+    
     def search_tasks(self):
         """Search tasks by keyword."""
         keyword = simpledialog.askstring("Search Tasks", "Enter search keyword:")
@@ -284,7 +574,12 @@ class TodoGUI:
             return
         
         keyword = keyword.lower()
-        matching_tasks = [t for t in self.tasks if keyword in t["description"].lower()]
+        with self.lock:
+            matching_tasks = self.store.search(keyword)
+            
+            # Follow exact matches with typo-tolerant ones
+            seen = {t["id"] for t in matching_tasks}
+            matching_tasks += [t for t in self.store.fuzzy_search(keyword) if t["id"] not in seen]
         
         if not matching_tasks:
             messagebox.showinfo("Search Results", f"No tasks found containing '{keyword}'")
@@ -293,14 +588,14 @@ class TodoGUI:
         # Create search results window
         self.show_search_results(matching_tasks, keyword)
     
-    def show_search_results(self, tasks, keyword):
-        """Show search results in a new window."""
-        search_window = tk.Toplevel(self.root)
-        search_window.title(f"Search Results for '{keyword}'")
+    SEARCH_COLUMNS = ('ID', 'Status', 'Priority', 'Description')
+    
+    def build_search_results(self, search_window):
+        """Create the widgets of the (reused) search results window."""
         search_window.geometry("600x400")
         
         # Create treeview for results
-        columns = ('ID', 'Status', 'Priority', 'Description')
+        columns = self.SEARCH_COLUMNS
         results_tree = ttk.Treeview(search_window, columns=columns, show='headings')
         
         for col in columns:
@@ -318,72 +613,40 @@ class TodoGUI:
         results_tree.pack(side='left', fill='both', expand=True)
         scrollbar.pack(side='right', fill='y')
         
+        self.search_rows = TreeRows(results_tree)
+    
+    @perfmon.timed("todo.show_search_results")
+    def show_search_results(self, tasks, keyword):
+        """Show search results in the search window, reusing it if already built."""
+        search_window = self.dialogs.get("search", self.build_search_results)
+        search_window.title(f"Search Results for '{keyword}'")
+        
         # Populate results
-        for task in tasks:
-            status = "✅ Done" if task["completed"] else "⏳ Pending"
-            priority = task["priority"].title()
-            
-            results_tree.insert('', 'end', values=(
-                task["id"], status, priority, task["description"]
-            ))
+        self.search_rows.update([task_row(t, self.SEARCH_COLUMNS) for t in tasks])
+        self.search_rows.tree.yview_moveto(0)
+        self.dialogs.show(search_window)
     
+    TASK_COLUMNS = ('ID', 'Status', 'Priority', 'Description', 'Created', 'Due')
+    
+    @perfmon.timed("todo.refresh_task_list")
     def refresh_task_list(self):
         """Refresh the task list based on current filter."""
-        # Clear existing items
-        for item in self.task_tree.get_children():
-            self.task_tree.delete(item)
-        
-        # Filter tasks
-        filter_type = self.filter_var.get()
-        filtered_tasks = self.tasks.copy()
-        
-        if filter_type == "Pending":
-            filtered_tasks = [t for t in self.tasks if not t["completed"]]
-        elif filter_type == "Completed":
-            filtered_tasks = [t for t in self.tasks if t["completed"]]
-        elif filter_type == "High Priority":
-            filtered_tasks = [t for t in self.tasks if t["priority"] == "high" and not t["completed"]]
-        
-        # Sort tasks (high priority first, then by ID)
-        priority_order = {"high": 0, "medium": 1, "low": 2}
-        filtered_tasks.sort(key=lambda x: (priority_order.get(x["priority"], 1), x["id"]))
-        
-        # Populate treeview
-        for task in filtered_tasks:
-            status = "✅ Done" if task["completed"] else "⏳ Pending"
-            priority = task["priority"].title()
-            created = task["created"].split()[0]  # Show only date
-            
-            # Color coding based on priority and status
-            tags = []
-            if task["completed"]:
-                tags.append("completed")
-            elif task["priority"] == "high":
-                tags.append("high_priority")
-            
-            self.task_tree.insert('', 'end', values=(
-                task["id"], status, priority, task["description"], created
-            ), tags=tags)
-        
-        # Configure tags for color coding
-        self.task_tree.tag_configure("completed", foreground="gray")
-        self.task_tree.tag_configure("high_priority", foreground="red", font=('Arial', 10, 'bold'))
+        # Filter and sort tasks (high priority first, then by ID)
+        now = now_str()
+        with self.lock:
+            self.shown_version = self.store.version
+            filtered_tasks = self.store.filtered(self.filter_var.get())
+            rows = [task_row(t, self.TASK_COLUMNS, now) for t in filtered_tasks]
+        
+        # Update only the rows that changed
+        perfmon.count("todo.rows_rendered", len(filtered_tasks))
+        self.task_rows.update(rows)
     
+    @perfmon.timed("todo.update_stats")
     def update_stats(self):
         """Update statistics display."""
-        total = len(self.tasks)
-        completed = len([t for t in self.tasks if t["completed"]])
-        pending = total - completed
-        high_priority = len([t for t in self.tasks if t["priority"] == "high" and not t["completed"]])
-        
-        stats_text = f"Total Tasks: {total}\n"
-        stats_text += f"Completed: {completed}\n"
-        stats_text += f"Pending: {pending}\n"
-        stats_text += f"High Priority: {high_priority}\n"
-        
-        if total > 0:
-            completion_rate = (completed / total) * 100
-            stats_text += f"Progress: {completion_rate:.1f}%"
+        with self.lock:
+            stats_text = format_stats(self.store.stats())
         
         self.stats_label.config(text=stats_text)
     
@@ -397,17 +660,17 @@ class TodoGUI:
         task_id = int(item['values'][0])
         
         # Find the task
-        task = next((t for t in self.tasks if t["id"] == task_id), None)
+        task = self.store.get(task_id)
         if not task:
             return
         
         # Show task details
         self.show_task_details(task)
     
-    def show_task_details(self, task):
-        """Show detailed task information in a popup."""
-        details_window = tk.Toplevel(self.root)
-        details_window.title(f"Task Details - ID {task['id']}")
+    DETAIL_FIELDS = ("ID:", "Status:", "Priority:", "Created:", "Due:", "Completed:")
+    
+    def build_task_details(self, details_window):
+        """Create the widgets of the (reused) task details window."""
         details_window.geometry("400x300")
         details_window.resizable(False, False)
         
@@ -417,38 +680,64 @@ class TodoGUI:
         details_frame = ttk.Frame(details_window)
         details_frame.pack(fill='both', expand=True, padx=20, pady=10)
         
-        details = [
-            ("ID:", str(task["id"])),
-            ("Status:", "✅ Completed" if task["completed"] else "⏳ Pending"),
-            ("Priority:", task["priority"].title()),
-            ("Created:", task["created"]),
-        ]
-        
-        if task["completed"]:
-            details.append(("Completed:", task.get("completed_date", "Unknown")))
+        rows_frame = ttk.Frame(details_frame)
+        rows_frame.pack(fill='x')
         
-        for label, value in details:
-            row_frame = ttk.Frame(details_frame)
-            row_frame.pack(fill='x', pady=2)
+        self.detail_rows = {}
+        for label in self.DETAIL_FIELDS:
+            row_frame = ttk.Frame(rows_frame)
             ttk.Label(row_frame, text=label, font=('Arial', 10, 'bold')).pack(side='left')
-            ttk.Label(row_frame, text=value).pack(side='left', padx=(10, 0))
+            value_label = ttk.Label(row_frame)
+            value_label.pack(side='left', padx=(10, 0))
+            self.detail_rows[label] = (row_frame, value_label)
         
         # Description
         ttk.Label(details_frame, text="Description:", font=('Arial', 10, 'bold')).pack(anchor='w', pady=(10, 2))
-        desc_text = tk.Text(details_frame, height=6, width=40, wrap='word', state='disabled')
-        desc_text.pack(fill='both', expand=True)
-        
-        desc_text.config(state='normal')
-        desc_text.insert('1.0', task["description"])
-        desc_text.config(state='disabled')
+        self.detail_text = tk.Text(details_frame, height=6, width=40, wrap='word', state='disabled')
+        self.detail_text.pack(fill='both', expand=True)
         
         # Close button
         ttk.Button(details_window, text="Close", 
-                  command=details_window.destroy).pack(pady=10)
+                  command=details_window.withdraw).pack(pady=10)
+    
+    @perfmon.timed("todo.show_task_details")
+    def show_task_details(self, task):
+        """Show detailed task information in the details popup."""
+        details_window = self.dialogs.get("details", self.build_task_details)
+        details_window.title(f"Task Details - ID {task['id']}")
+        
+        details = {
+            "ID:": str(task["id"]),
+            "Status:": "✅ Completed" if task["completed"] else "⏳ Pending",
+            "Priority:": task["priority"].title(),
+            "Created:": task["created"],
+        }
+        
+        if task.get("due"):
+            details["Due:"] = task["due"]
+        
+        if task["completed"]:
+            details["Completed:"] = task.get("completed_date", "Unknown")
+        
+        # Re-pack rows in order so the optional "Completed:" row stays last
+        for label in self.DETAIL_FIELDS:
+            row_frame, value_label = self.detail_rows[label]
+            row_frame.pack_forget()
+            if label in details:
+                value_label.config(text=details[label])
+                row_frame.pack(fill='x', pady=2)
+        
+        self.detail_text.config(state='normal')
+        self.detail_text.delete('1.0', tk.END)
+        self.detail_text.insert('1.0', task["description"])
+        self.detail_text.config(state='disabled')
+        
+        self.dialogs.show(details_window)
     
     def run(self):
         """Start the GUI application."""
         print("🚀 Starting GUI application...")
+        perfmon.install(self.root)
         
         # Set window icon (if available)
         try:
@@ -477,6 +766,14 @@ class TodoGUI:
 
 def main():
     """Main function to run the application."""
+    try:
+        load_tkinter()
+        print("✅ Tkinter imported successfully")
+    except ImportError as e:
+        print(f"❌ Error importing tkinter: {e}")
+        print("Please install tkinter or use a Python version with tkinter included")
+        sys.exit(1)
+    
     try:
         app = TodoGUI()
         app.run()
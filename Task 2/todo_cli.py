@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+To-Do Command Line Interface
+Headless front end for the task store; does not import tkinter.
+
+Examples:
+    python todo_cli.py add "Buy milk" --priority high --due 2025-06-01
+    python todo_cli.py due 3 "2025-06-01 18:00"
+    python todo_cli.py list --filter Pending
+    python todo_cli.py complete 3
+    printf 'add "Water plants"\\ncomplete 1\\n' | python todo_cli.py batch
+    python todo_cli.py sync http://127.0.0.1:8766
+"""
+
+import argparse
+import shlex
+import sys
+
+from todo_core import TaskStore, FILTERS, PRIORITIES, format_stats
+
+
+def format_task(task) -> str:
+    """One-line representation of a task for terminal output."""
+    status = "x" if task["completed"] else " "
+    created = task["created"].split()[0]
+    line = f"{task['id']:>4} [{status}] {task['priority']:<6} {created}  {task['description']}"
+    if task.get("due"):
+        line += f"  (due {task['due'][:16]})"
+    return line
+
+
+def cmd_add(store, args, out):
+    task = store.add(" ".join(args.description), args.priority, args.due)
+    out.write(f"Added task {task['id']}\n")
+    return True
+
+
+def cmd_list(store, args, out):
+    for task in store.filtered(args.filter):
+        out.write(format_task(task) + "\n")
+    return False
+
+
+def cmd_complete(store, args, out):
+    if store.complete(args.id):
+        out.write(f"Completed task {args.id}\n")
+        return True
+    out.write(f"Task {args.id} is already completed\n")
+    return False
+
+
+def cmd_due(store, args, out):
+    task = store.set_due(args.id, " ".join(args.due))
+    if task["due"]:
+        out.write(f"Task {args.id} is due {task['due']}\n")
+    else:
+        out.write(f"Cleared due date of task {args.id}\n")
+    return True
+
+
+def cmd_delete(store, args, out):
+    store.delete(args.id)
+    out.write(f"Deleted task {args.id}\n")
+    return True
+
+
+def cmd_search(store, args, out):
+    keyword = " ".join(args.keyword)
+    if args.fuzzy:
+        tasks = store.fuzzy_search(keyword, args.limit)
+    else:
+        tasks = sorted(store.search(keyword), key=lambda t: t["id"])
+    for task in tasks:
+        out.write(format_task(task) + "\n")
+    return False
+
+
+def cmd_stats(store, args, out):
+    out.write(format_stats(store.stats()).rstrip("\n") + "\n")
+    return False
+
+
+def cmd_sync(store, args, out):
+    from todo_sync import SyncClient, sync
+    client = SyncClient(args.url)
+    try:
+        result = sync(store, client)
+    finally:
+        client.close()
+    out.write(f"Pushed {result['pushed']}, pulled {result['pulled']} "
+              f"({result['sent']} bytes sent, {result['received']} received)\n")
+    return False
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="todo", description="Manage the to-do list from the command line.")
+    parser.add_argument("-f", "--file", default="tasks.json", help="task file (default: tasks.json)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("add", help="add a new task")
+    p.add_argument("description", nargs="+")
+    p.add_argument("-p", "--priority", default="medium", choices=PRIORITIES)
+    p.add_argument("--due", help="due date, YYYY-MM-DD [HH:MM]")
+    p.set_defaults(func=cmd_add)
+
+    p = sub.add_parser("list", help="list tasks")
+    p.add_argument("--filter", default="All", choices=FILTERS)
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser("complete", help="mark a task as completed")
+    p.add_argument("id", type=int)
+    p.set_defaults(func=cmd_complete)
+
+    p = sub.add_parser("due", help="set a task's due date (omit the date to clear it)")
+    p.add_argument("id", type=int)
+    p.add_argument("due", nargs="*", help="YYYY-MM-DD [HH:MM]")
+    p.set_defaults(func=cmd_due)
+
+    p = sub.add_parser("delete", help="delete a task")
+    p.add_argument("id", type=int)
+    p.set_defaults(func=cmd_delete)
+
+    p = sub.add_parser("search", help="search task descriptions")
+    p.add_argument("keyword", nargs="+")
+    p.add_argument("--fuzzy", action="store_true", help="typo-tolerant search, best match first")
+    p.add_argument("--limit", type=int, default=50, help="maximum fuzzy results (default: 50)")
+    p.set_defaults(func=cmd_search)
+
+    p = sub.add_parser("stats", help="show task statistics")
+    p.set_defaults(func=cmd_stats)
+
+    p = sub.add_parser("sync", help="exchange changes with a todo_sync server")
+    p.add_argument("url", help="sync server URL, e.g. http://127.0.0.1:8766")
+    p.set_defaults(func=cmd_sync)
+
+    sub.add_parser("batch", help="read one command per line from stdin and save once at the end")
+
+    return parser
+
+
+def run_batch(parser, store, lines, out, err) -> int:
+    """Apply commands from lines to store, saving once if anything changed.
+
+    Blank lines and lines starting with '#' are ignored. A failing command is
+    reported on err and the rest of the batch still runs.
+    """
+    changed = False
+    failures = 0
+    for lineno, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            args = parser.parse_args(shlex.split(line))
+            if args.command == "batch":
+                raise ValueError("batch cannot be nested")
+            changed |= args.func(store, args, out)
+        except SystemExit:
+            # argparse already printed the usage error
+            failures += 1
+            err.write(f"line {lineno}: invalid command: {line}\n")
+        except KeyError as e:
+            failures += 1
+            err.write(f"line {lineno}: No task with ID {e}\n")
+        except ValueError as e:
+            failures += 1
+            err.write(f"line {lineno}: {e}\n")
+
+    if changed:
+        store.save()
+    return 1 if failures else 0
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    store = TaskStore(args.file)
+
+    if args.command == "batch":
+        return run_batch(parser, store, sys.stdin, sys.stdout, sys.stderr)
+
+    try:
+        if args.func(store, args, sys.stdout):
+            store.save()
+    except KeyError as e:
+        sys.stderr.write(f"No task with ID {e}\n")
+        return 1
+    except (ValueError, OSError) as e:
+        sys.stderr.write(f"Error: {e}\n")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+To-Do Task Core
+Task model and JSON storage shared by the GUI, the CLI and other tools.
+This module never imports tkinter, so it can be used headless.
+
+For replication (see todo_sync) every task carries a global "uid" and, in
+"_stamps", a [clock, replica] logical version per field. Replica state
+that does not belong in tasks.json (replica ID, tombstones of deleted
+tasks, changes not yet pushed) is kept in a "<file>.sync" sidecar.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional
+
+import perfmon
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+PRIORITIES = ("high", "medium", "low")
+PRIORITY_ORDER = {"high": 0, "medium": 1, "low": 2}
+FILTERS = ("All", "Pending", "Completed", "High Priority", "Due Soon", "Overdue")
+# Pending tasks due within this window are listed under "Due Soon"
+DUE_SOON = timedelta(hours=24)
+# Task fields replicated by todo_sync, each with its own logical version
+SYNC_FIELDS = ("description", "priority", "completed", "created", "completed_date", "due")
+
+
+def now_str() -> str:
+    """Current local time in the format stored in tasks.json."""
+    return datetime.now().strftime(TIME_FORMAT)
+
+
+def parse_due(text: Optional[str]) -> Optional[str]:
+    """Normalise a due date ("YYYY-MM-DD", optionally with "HH:MM[:SS]") to
+    TIME_FORMAT. A date alone means the end of that day; empty means no due date.
+    Raises ValueError for anything else.
+    """
+    text = (text or "").strip()
+    if not text:
+        return None
+    for fmt in (TIME_FORMAT, "%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            due = datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+        if fmt == "%Y-%m-%d":
+            due = due.replace(hour=23, minute=59, second=59)
+        return due.strftime(TIME_FORMAT)
+    raise ValueError(f"Invalid due date: {text} (use YYYY-MM-DD [HH:MM])")
+
+
+def due_timestamp(task: Dict) -> Optional[float]:
+    """POSIX time a task is due, or None."""
+    due = task.get("due")
+    return datetime.strptime(due, TIME_FORMAT).timestamp() if due else None
+
+
+def sort_key(task: Dict):
+    """Sort key used by every task listing (high priority first, then by ID)."""
+    return (PRIORITY_ORDER.get(task["priority"], 1), task["id"])
+
+
+def legacy_uid(task: Dict) -> str:
+    """Uid for a task saved before replication existed.
+
+    Derived from the task itself rather than random, so copies of the same
+    tasks.json migrated on different machines agree and merge instead of
+    duplicating every task on the first sync.
+    """
+    key = f"{task['id']}|{task.get('created', '')}|{task.get('description', '')}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:32]
+
+
+class TaskStore:
+    """In-memory task list backed by a JSON file."""
+
+    def __init__(self, filename: str = "tasks.json"):
+        self.filename = filename
+        self.tasks: List[Dict] = []
+        self._by_id: Dict[int, Dict] = {}
+        self._max_id = 0
+        # Word index for fuzzy_search(), built on first use or in the
+        # background by build_index(); while a build runs, changes are
+        # queued in _index_pending and replayed onto the new index
+        self._index = None
+        self._index_thread = None
+        self._index_pending = None
+        self._index_lock = threading.Lock()
+        # Bumped on every change so callers can cheaply detect staleness
+        self.version = 0
+        # Replication state: Lamport clock, deleted uids and unpushed uids
+        self.replica = ""
+        self.clock = 0
+        self.sync_seq = 0
+        self.tombstones: Dict[str, List] = {}
+        self.unpushed: Dict[str, int] = {}
+        self._by_uid: Dict[str, Dict] = {}
+        self.load()
+
+    @perfmon.timed("todo.load_tasks")
+    def load(self) -> List[Dict]:
+        """Load tasks from the JSON file (a missing or corrupt file gives an empty list)."""
+        try:
+            if os.path.exists(self.filename):
+                with open(self.filename, 'r') as f:
+                    tasks = json.load(f)
+            else:
+                tasks = []
+        except (json.JSONDecodeError, FileNotFoundError):
+            tasks = []
+
+        self.tasks = tasks
+        self._load_sync_state()
+        self._reindex()
+        self.version += 1
+        return self.tasks
+
+    def _load_sync_state(self):
+        try:
+            with open(self.filename + ".sync", 'r') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        self.replica = state.get("replica") or uuid.uuid4().hex[:12]
+        self.clock = state.get("clock", 0)
+        self.sync_seq = state.get("seq", 0)
+        self.tombstones = state.get("tombstones", {})
+        self.unpushed = state.get("unpushed", {})
+
+    @perfmon.timed("todo.save_tasks")
+    def save(self):
+        """Save tasks to the JSON file.
+
+        The file is written to a temporary name and renamed into place so a
+        crash mid-write never leaves a truncated tasks.json behind.
+        """
+        tmp_name = self.filename + ".tmp"
+        with open(tmp_name, 'w') as f:
+            json.dump(self.tasks, f, indent=2)
+        os.replace(tmp_name, self.filename)
+
+        state = {"replica": self.replica, "clock": self.clock, "seq": self.sync_seq,
+                 "tombstones": self.tombstones, "unpushed": self.unpushed}
+        with open(tmp_name, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_name, self.filename + ".sync")
+
+    def _reindex(self):
+        self._by_id = {t["id"]: t for t in self.tasks}
+        self._max_id = max(self._by_id, default=0)
+        with self._index_lock:
+            self._index = None
+            self._index_thread = None
+            self._index_pending = None
+        for task in self.tasks:
+            for stamp in task.get("_stamps", {}).values():
+                self.clock = max(self.clock, stamp[0])
+        for task in self.tasks:
+            if "uid" not in task:
+                # Task from before replication: publish it as a local change
+                task["uid"] = legacy_uid(task)
+                self._touch(task, *[f for f in SYNC_FIELDS if f in task])
+        self._by_uid = {t["uid"]: t for t in self.tasks}
+
+    def _touch(self, task: Dict, *fields: str):
+        """Give fields a new logical version and queue the task for the next sync."""
+        self.clock += 1
+        stamps = task.setdefault("_stamps", {})
+        for field in fields:
+            stamps[field] = [self.clock, self.replica]
+        self.unpushed[task["uid"]] = self.clock
+
+    def get(self, task_id: int) -> Optional[Dict]:
+        """Return the task with the given ID, or None."""
+        return self._by_id.get(task_id)
+
+    def add(self, description: str, priority: str = "medium", due: Optional[str] = None) -> Dict:
+        """Create a new pending task and return it.
+
+        due is an optional due date in any form parse_due() accepts.
+        """
+        description = description.strip()
+        if not description:
+            raise ValueError("Task description must not be empty")
+        priority = priority.lower()
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {priority}")
+        due = parse_due(due)
+
+        self._max_id += 1
+        task = {
+            "id": self._max_id,
+            "description": description,
+            "priority": priority,
+            "completed": False,
+            "created": now_str(),
+            "uid": uuid.uuid4().hex
+        }
+        fields = ["description", "priority", "completed", "created"]
+        if due:
+            task["due"] = due
+            fields.append("due")
+        self._touch(task, *fields)
+        self.tasks.append(task)
+        self._by_id[task["id"]] = task
+        self._by_uid[task["uid"]] = task
+        self._index_changed(task["id"], description)
+        self.version += 1
+        return task
+
+    def complete(self, task_id: int) -> bool:
+        """Mark a task as completed.
+
+        Returns False if the task was already completed. Raises KeyError if
+        there is no task with that ID.
+        """
+        task = self._by_id[task_id]
+        if task["completed"]:
+            return False
+        task["completed"] = True
+        task["completed_date"] = now_str()
+        self._touch(task, "completed", "completed_date")
+        self.version += 1
+        return True
+
+    def set_due(self, task_id: int, due: Optional[str]) -> Dict:
+        """Set (or with None/"" clear) a task's due date and return the task.
+
+        Raises KeyError if there is no such task and ValueError for a bad date.
+        """
+        task = self._by_id[task_id]
+        task["due"] = parse_due(due)
+        self._touch(task, "due")
+        self.version += 1
+        return task
+
+    def delete(self, task_id: int) -> Dict:
+        """Remove a task and return it. Raises KeyError if it does not exist."""
+        task = self._by_id[task_id]
+        self._forget(task)
+        self.clock += 1
+        self.tombstones[task["uid"]] = [self.clock, self.replica]
+        self.unpushed[task["uid"]] = self.clock
+        return task
+
+    def _forget(self, task: Dict):
+        self._by_id.pop(task["id"], None)
+        self._by_uid.pop(task["uid"], None)
+        self.tasks.remove(task)
+        self._index_changed(task["id"], None)
+        self.version += 1
+
+    def apply_remote(self, uid: str, fields: Dict[str, List]) -> bool:
+        """Merge replicated values {field: [value, [clock, replica]]} into the task uid.
+
+        Each field keeps the value with the higher (clock, replica) stamp, so
+        every replica converges on the same result whatever the merge order.
+        A delete, sent as the "deleted" field, wins over any edit. Unknown
+        tasks are created with a fresh local ID. Returns True if anything changed.
+        """
+        for _, stamp in fields.values():
+            self.clock = max(self.clock, stamp[0])
+        if uid in self.tombstones:
+            return False
+        task = self._by_uid.get(uid)
+        if "deleted" in fields:
+            self.tombstones[uid] = list(fields["deleted"][1])
+            self.unpushed.pop(uid, None)
+            if task is None:
+                return False
+            self._forget(task)
+            return True
+
+        changed = False
+        if task is None:
+            self._max_id += 1
+            task = {"id": self._max_id, "description": "", "priority": "medium",
+                    "completed": False, "created": now_str(), "uid": uid, "_stamps": {}}
+            self.tasks.append(task)
+            self._by_id[task["id"]] = task
+            self._by_uid[uid] = task
+            changed = True
+        stamps = task["_stamps"]
+        for field, (value, stamp) in fields.items():
+            if field in SYNC_FIELDS and stamp > stamps.get(field, [0, ""]):
+                task[field] = value
+                stamps[field] = list(stamp)
+                changed = True
+        if changed:
+            self._index_changed(task["id"], task["description"])
+            self.version += 1
+        return changed
+
+    def replicated_fields(self, uid: str) -> Dict[str, List]:
+        """The task uid (or its tombstone) in the form apply_remote() takes."""
+        if uid in self.tombstones:
+            return {"deleted": [True, self.tombstones[uid]]}
+        task = self._by_uid[uid]
+        return {field: [task.get(field), stamp] for field, stamp in task["_stamps"].items()}
+
+    def search(self, keyword: str) -> List[Dict]:
+        """Return tasks whose description contains keyword (case-insensitive)."""
+        keyword = keyword.lower()
+        return [t for t in self.tasks if keyword in t["description"].lower()]
+
+    def build_index(self):
+        """Start building the fuzzy search index on a background thread, so
+        an interactive caller never waits for it on its first search."""
+        with self._index_lock:
+            if self._index is not None or self._index_thread is not None:
+                return
+            snapshot = [(t["id"], t["description"]) for t in self.tasks]
+            pending = self._index_pending = []
+            thread = self._index_thread = threading.Thread(
+                target=self._build_index, args=(snapshot, pending), name="todo-index", daemon=True)
+        thread.start()
+
+    def _build_index(self, snapshot, pending):
+        from todo_search import FuzzyIndex
+        index = FuzzyIndex()
+        for task_id, description in snapshot:
+            index.add(task_id, description)
+        with self._index_lock:
+            if self._index_pending is not pending:
+                return  # Reloaded meanwhile; this index is stale
+            for task_id, description in pending:
+                if description is None:
+                    index.remove(task_id)
+                else:
+                    index.add(task_id, description)
+            self._index = index
+            self._index_thread = None
+            self._index_pending = None
+
+    def _index_changed(self, task_id: int, description: Optional[str]):
+        """Keep the fuzzy index (or the one being built) in step with a change."""
+        with self._index_lock:
+            if self._index is not None:
+                if description is None:
+                    self._index.remove(task_id)
+                else:
+                    self._index.add(task_id, description)
+            elif self._index_pending is not None:
+                self._index_pending.append((task_id, description))
+
+    def fuzzy_search(self, query: str, limit: int = 50, threshold: float = 0.3) -> List[Dict]:
+        """Return tasks whose description approximately matches query, best first.
+
+        Tolerates typos and swapped letters via a word index that is built
+        on the first call (or by build_index()) and then kept up to date.
+        """
+        thread = self._index_thread
+        if thread is not None:
+            thread.join()
+        if self._index is None:
+            from todo_search import FuzzyIndex
+            self._index = FuzzyIndex(self.tasks)
+        return [self._by_id[task_id] for _, task_id in self._index.search(query, limit, threshold)]
+
+    def filtered(self, filter_type: str = "All") -> List[Dict]:
+        """Return tasks matching one of FILTERS, sorted for display."""
+        if filter_type == "Pending":
+            tasks = [t for t in self.tasks if not t["completed"]]
+        elif filter_type == "Completed":
+            tasks = [t for t in self.tasks if t["completed"]]
+        elif filter_type == "High Priority":
+            tasks = [t for t in self.tasks if t["priority"] == "high" and not t["completed"]]
+        elif filter_type in ("Due Soon", "Overdue"):
+            # TIME_FORMAT strings compare in chronological order
+            now = datetime.now()
+            start = now.strftime(TIME_FORMAT)
+            if filter_type == "Overdue":
+                tasks = [t for t in self.tasks if not t["completed"] and t.get("due") and t["due"] < start]
+            else:
+                end = (now + DUE_SOON).strftime(TIME_FORMAT)
+                tasks = [t for t in self.tasks if not t["completed"] and t.get("due")
+                         and start <= t["due"] <= end]
+            # Soonest deadline first
+            tasks.sort(key=lambda t: (t["due"], sort_key(t)))
+            return tasks
+        else:
+            tasks = list(self.tasks)
+        tasks.sort(key=sort_key)
+        return tasks
+
+    def stats(self) -> Dict:
+        """Return task counters used by the statistics panel."""
+        total = len(self.tasks)
+        completed = sum(1 for t in self.tasks if t["completed"])
+        high_priority = sum(1 for t in self.tasks if t["priority"] == "high" and not t["completed"])
+        now = now_str()
+        overdue = sum(1 for t in self.tasks if not t["completed"] and t.get("due") and t["due"] < now)
+        return {
+            "total": total,
+            "completed": completed,
+            "pending": total - completed,
+            "high_priority": high_priority,
+            "overdue": overdue,
+            "completion_rate": (completed / total) * 100 if total else None,
+        }
+
+
+def format_stats(stats: Dict) -> str:
+    """Render the stats dictionary as the multi-line statistics text."""
+    stats_text = f"Total Tasks: {stats['total']}\n"
+    stats_text += f"Completed: {stats['completed']}\n"
+    stats_text += f"Pending: {stats['pending']}\n"
+    stats_text += f"High Priority: {stats['high_priority']}\n"
+    if stats.get("overdue"):
+        stats_text += f"Overdue: {stats['overdue']}\n"
+
+    if stats["completion_rate"] is not None:
+        stats_text += f"Progress: {stats['completion_rate']:.1f}%"
+
+    return stats_text
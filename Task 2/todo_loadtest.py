@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+To-Do Service Load Test
+Hammers a todo_server instance over keep-alive connections and reports
+throughput and latency percentiles.
+
+By default an in-process server is started on a free localhost port with a
+temporary task file, so the script is self-contained:
+
+    python todo_loadtest.py --threads 8 --duration 5
+    python todo_loadtest.py --url http://127.0.0.1:8765 --write-ratio 0.05
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+from todo_core import TaskStore
+from todo_server import TaskServer, TaskService
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def worker(host, port, deadline, write_ratio, seed, results):
+    """Issue requests on one persistent connection until deadline."""
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    etags = {}
+    latencies = []
+    statuses = {}
+    paths = ["/tasks?limit=20", "/tasks?filter=Pending&limit=20", "/stats", "/search?q=task"]
+
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        if rng.random() < write_ratio:
+            body = json.dumps({"description": f"load test task {rng.randrange(10**6)}"})
+            conn.request("POST", "/tasks", body, {"Content-Type": "application/json"})
+        else:
+            path = rng.choice(paths)
+            headers = {"If-None-Match": etags[path]} if path in etags else {}
+            conn.request("GET", path, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        statuses[response.status] = statuses.get(response.status, 0) + 1
+        if response.getheader("ETag"):
+            etags[path] = response.getheader("ETag")
+
+    conn.close()
+    results.append((latencies, statuses))
+
+
+def run(host, port, threads, duration, write_ratio):
+    results = []
+    deadline = time.perf_counter() + duration
+    pool = [threading.Thread(target=worker, args=(host, port, deadline, write_ratio, i, results))
+            for i in range(threads)]
+    started = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(l for lat, _ in results for l in lat)
+    statuses = {}
+    for _, counts in results:
+        for status, n in counts.items():
+            statuses[status] = statuses.get(status, 0) + n
+
+    print(f"requests:   {len(latencies)} in {elapsed:.2f}s ({len(latencies) / elapsed:.0f} req/s)")
+    print(f"statuses:   {dict(sorted(statuses.items()))}")
+    for pct in (50, 90, 99):
+        print(f"p{pct:<9} {percentile(latencies, pct) * 1000:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the to-do JSON service.")
+    parser.add_argument("--url", help="existing server to test (default: start one in-process)")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds")
+    parser.add_argument("--write-ratio", type=float, default=0.02, help="fraction of POST requests")
+    parser.add_argument("--seed-tasks", type=int, default=1000, help="tasks to create for an in-process server")
+    args = parser.parse_args()
+
+    if args.url:
+        url = urlsplit(args.url)
+        run(url.hostname, url.port or 80, args.threads, args.duration, args.write_ratio)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = TaskStore(os.path.join(tmp, "tasks.json"))
+        for i in range(args.seed_tasks):
+            store.add(f"seed task {i}", ("high", "medium", "low")[i % 3])
+        service = TaskService(store)
+        server = TaskServer(("127.0.0.1", 0), service)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            run("127.0.0.1", server.server_port, args.threads, args.duration, args.write_ratio)
+        finally:
+            server.shutdown()
+            server.server_close()
+            service.close()
+
+
+if __name__ == "__main__":
+    main()
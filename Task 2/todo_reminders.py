@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+To-Do Reminders
+Fires a callback when a task falls due, with one timer for all tasks.
+
+Upcoming due times sit in a min-heap. Only the earliest is ever armed (via
+root.after in the GUI), so the cost of a change is O(log n) and nothing
+scans the task list periodically. Cancelled or rescheduled entries are left
+in the heap and skipped when they reach the top.
+
+This module does not import tkinter; pass any after()/after_cancel() pair.
+"""
+
+import heapq
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from todo_core import due_timestamp
+
+# Tk's after() takes a C int of milliseconds; re-arm at least daily
+MAX_DELAY_MS = 24 * 3600 * 1000
+
+
+class ReminderScheduler:
+    """Min-heap of (due time, task ID) driving a single after() timer."""
+
+    def __init__(self, after: Callable, after_cancel: Callable, on_due: Callable[[int], None],
+                 clock: Callable[[], float] = time.time):
+        self.after = after
+        self.after_cancel = after_cancel
+        self.on_due = on_due
+        self.clock = clock
+        self.heap: List[Tuple[float, int]] = []
+        self.due: Dict[int, float] = {}   # task ID -> live due time
+        self.fired: Dict[int, float] = {}  # task ID -> due time already reminded
+        self.timer = None
+        self.timer_at: Optional[float] = None
+
+    def __len__(self):
+        return len(self.due)
+
+    def reset(self, tasks: Iterable[Dict]):
+        """Rebuild from a whole task list (on load or after a sync).
+
+        Due times whose reminder was already delivered are left out, so a
+        rebuild never repeats one; any other due time is kept, even if it
+        passed before its timer got to run.
+        """
+        due = {}
+        fired = {}
+        for task in tasks:
+            if task.get("due") and not task["completed"]:
+                when = due_timestamp(task)
+                if self.fired.get(task["id"]) == when:
+                    fired[task["id"]] = when
+                else:
+                    due[task["id"]] = when
+        self.due = due
+        self.fired = fired
+        self.heap = [(when, task_id) for task_id, when in self.due.items()]
+        heapq.heapify(self.heap)
+        self._arm()
+
+    def schedule(self, task: Dict):
+        """Add, move or (if it has no due date or is completed) cancel a task's reminder."""
+        if not task.get("due") or task["completed"]:
+            self.cancel(task["id"])
+            return
+        when = due_timestamp(task)
+        if self.due.get(task["id"]) == when or self.fired.get(task["id"]) == when:
+            return
+        self.due[task["id"]] = when
+        heapq.heappush(self.heap, (when, task["id"]))
+        # Stale entries pile up only under heavy rescheduling; compact then
+        if len(self.heap) > 2 * len(self.due) + 64:
+            self.heap = [(w, i) for i, w in self.due.items()]
+            heapq.heapify(self.heap)
+        self._arm()
+
+    def cancel(self, task_id: int):
+        if self.due.pop(task_id, None) is not None:
+            self._arm()
+
+    def _head(self) -> Optional[Tuple[float, int]]:
+        """Earliest live entry, discarding stale ones above it."""
+        heap = self.heap
+        while heap:
+            when, task_id = heap[0]
+            if self.due.get(task_id) == when:
+                return heap[0]
+            heapq.heappop(heap)
+        return None
+
+    def _arm(self):
+        """Make the single timer match the earliest live due time."""
+        head = self._head()
+        when = head[0] if head else None
+        if when == self.timer_at:
+            return
+        if self.timer is not None:
+            self.after_cancel(self.timer)
+            self.timer = None
+        self.timer_at = when
+        if when is not None:
+            delay = max(0, min(MAX_DELAY_MS, int((when - self.clock()) * 1000)))
+            self.timer = self.after(delay, self._fire)
+
+    def _fire(self):
+        self.timer = None
+        self.timer_at = None
+        now = self.clock()
+        fired = []
+        while True:
+            head = self._head()
+            if head is None or head[0] > now:
+                break
+            heapq.heappop(self.heap)
+            del self.due[head[1]]
+            self.fired[head[1]] = head[0]
+            fired.append(head[1])
+        self._arm()
+        for task_id in fired:
+            self.on_due(task_id)
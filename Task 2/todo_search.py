@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+To-Do Fuzzy Search
+Word index over task descriptions for typo-tolerant lookup.
+
+Descriptions are split into lower-case words, and each distinct word is
+indexed once however many tasks use it, grouped by length and by a bit
+mask of the letters it contains. Each query word is matched in two steps:
+
+1. Candidate generation - groups whose length and letters allow a close
+   enough match. Each letter one word has and the other lacks costs at
+   least one edit, so whole groups are rejected by two popcounts.
+   This is deliberately loose: unlike shared trigrams it keeps
+   transpositions such as "mlik" or "act", which share few or none.
+2. Ranking - each candidate scores 1 - distance / length, where the
+   distance is the edit distance counting a swap of adjacent letters as
+   one edit, so "mlik", "reprot" and "reoprt" are one edit from the words
+   they mistype. Words scoring below WORD_THRESHOLD do not match.
+
+A task scores the mean, over the query words, of its best-matching word.
+Length and letters bound a group's score, so one-word queries try the most
+promising groups first and stop once no other group can reach the top
+results.
+"""
+
+import heapq
+import math
+import re
+from typing import Dict, Iterable, List, Set, Tuple
+
+WORD_RE = re.compile(r"\w+")
+
+# Least similarity for a word to count as a match for a query word
+WORD_THRESHOLD = 0.6
+
+
+def words(text: str) -> List[str]:
+    """Lower-case words of text, in order."""
+    return WORD_RE.findall(text.lower())
+
+
+def letter_mask(word: str) -> int:
+    """Bit mask of the characters in word: one bit per ASCII character,
+    non-ASCII ones folded onto the same 128 bits."""
+    mask = 0
+    for ch in word:
+        mask |= 1 << (ord(ch) & 127)
+    return mask
+
+
+def pattern_masks(word: str) -> Dict[str, int]:
+    """Per-character bit masks of the positions where it occurs in word."""
+    masks = {}
+    for i, ch in enumerate(word):
+        masks[ch] = masks.get(ch, 0) | 1 << i
+    return masks
+
+
+def edit_distance(a: str, b: str, masks: Dict[str, int] = None) -> int:
+    """Edit distance between a and b counting an adjacent transposition as
+    one edit (optimal string alignment).
+
+    Bit-parallel (Hyyro, 2003): one pass over b with a column of len(a)
+    bits per step. masks is pattern_masks(a), if already computed.
+    """
+    m = len(a)
+    if not m:
+        return len(b)
+    if masks is None:
+        masks = pattern_masks(a)
+    full = (1 << m) - 1
+    last = 1 << (m - 1)
+    vp, vn = full, 0
+    d0 = pm_prev = 0
+    distance = m
+    for ch in b:
+        pm = masks.get(ch, 0)
+        transposed = ((~d0 & pm) << 1) & pm_prev
+        d0 = ((((pm & vp) + vp) ^ vp) | pm | vn | transposed) & full
+        hp = (vn | ~(d0 | vp)) & full
+        hn = d0 & vp
+        if hp & last:
+            distance += 1
+        elif hn & last:
+            distance -= 1
+        hp = ((hp << 1) | 1) & full
+        hn = (hn << 1) & full
+        vp = (hn | ~(d0 | hp)) & full
+        vn = hp & d0
+        pm_prev = pm
+    return distance
+
+
+class FuzzyIndex:
+    """Inverted index from words to task IDs, with the distinct words
+    grouped by length and letters. Kept current on add/remove."""
+
+    def __init__(self, tasks: Iterable[Dict] = ()):
+        self.task_words: Dict[int, Tuple[str, ...]] = {}
+        self.word_tasks: Dict[str, Set[int]] = {}
+        # length -> letter_mask -> words
+        self.groups: Dict[int, Dict[int, Set[str]]] = {}
+        for task in tasks:
+            self.add(task["id"], task["description"])
+
+    def __len__(self):
+        return len(self.task_words)
+
+    def add(self, task_id: int, text: str):
+        """Index (or re-index) one task description."""
+        if task_id in self.task_words:
+            self.remove(task_id)
+        distinct = tuple(set(words(text)))
+        self.task_words[task_id] = distinct
+        word_tasks = self.word_tasks
+        for word in distinct:
+            ids = word_tasks.get(word)
+            if ids is None:
+                word_tasks[word] = {task_id}
+                masks = self.groups.get(len(word))
+                if masks is None:
+                    masks = self.groups[len(word)] = {}
+                mask = letter_mask(word)
+                group = masks.get(mask)
+                if group is None:
+                    masks[mask] = {word}
+                else:
+                    group.add(word)
+            else:
+                ids.add(task_id)
+
+    def remove(self, task_id: int):
+        """Drop a task from the index; unknown IDs are ignored."""
+        for word in self.task_words.pop(task_id, ()):
+            ids = self.word_tasks[word]
+            ids.discard(task_id)
+            if not ids:
+                # Last task using the word; forget the word itself
+                del self.word_tasks[word]
+                masks = self.groups[len(word)]
+                mask = letter_mask(word)
+                masks[mask].discard(word)
+                if not masks[mask]:
+                    del masks[mask]
+
+    def candidates(self, word: str) -> List[Tuple[float, int, Set[str]]]:
+        """(bound, length, words) groups that may match word, best bound first.
+
+        bound is the highest similarity any word in the group can have.
+        """
+        query_length = len(word)
+        letters = letter_mask(word)
+        shortest = max(1, math.ceil(WORD_THRESHOLD * query_length - 1e-9))
+        longest = int(query_length / WORD_THRESHOLD + 1e-9)
+        found = []
+        for length in range(shortest, longest + 1):
+            masks = self.groups.get(length)
+            if not masks:
+                continue
+            size = max(query_length, length)
+            limit = int((1 - WORD_THRESHOLD) * size + 1e-9)
+            for mask, group in masks.items():
+                edits = max(abs(length - query_length), (letters & ~mask).bit_count(),
+                            (mask & ~letters).bit_count())
+                if edits <= limit:
+                    found.append((1 - edits / size, length, group))
+        found.sort(key=lambda item: -item[0])
+        return found
+
+    def search(self, query: str, limit: int = 50, threshold: float = 0.3) -> List[Tuple[float, int]]:
+        """Return up to limit (score, task_id) pairs, best match first.
+
+        Scores are in [0, 1]; matches scoring below threshold are dropped.
+        """
+        query_words = list(dict.fromkeys(words(query)))
+        if not query_words or limit <= 0:
+            return []
+        streams = [self.candidates(word) for word in query_words]
+        masks = [pattern_masks(word) for word in query_words]
+        similarities: List[Dict[str, float]] = [{} for _ in query_words]
+
+        def similarity(i: int, other: str) -> float:
+            known = similarities[i].get(other)
+            if known is None:
+                word = query_words[i]
+                size = max(len(word), len(other))
+                allowed = int((1 - WORD_THRESHOLD) * size + 1e-9)
+                distance = allowed + 1
+                if abs(len(word) - len(other)) <= allowed:
+                    distance = edit_distance(word, other, masks[i])
+                known = similarities[i][other] = 1 - distance / size if distance <= allowed else 0.0
+            return known
+
+        # Threshold algorithm: take groups from the query word with the best
+        # remaining bound and score each newly seen task exactly. No unseen
+        # task can beat the mean of the remaining bounds, so stop once the
+        # top results all do (strictly, as ties go to lower IDs).
+        top: List[Tuple[float, int]] = []   # min-heap of (score, -task_id)
+        seen: Set[int] = set()
+        position = [0] * len(query_words)
+        while True:
+            frontier = [stream[p][0] if p < len(stream) else 0.0
+                        for stream, p in zip(streams, position)]
+            ceiling = sum(frontier) / len(query_words)
+            if ceiling < threshold or (len(top) >= limit and top[0][0] > ceiling):
+                break
+            i = frontier.index(max(frontier))
+            _, _, group = streams[i][position[i]]
+            position[i] += 1
+            for candidate in group:
+                if not similarity(i, candidate):
+                    continue
+                for task_id in self.word_tasks[candidate]:
+                    if task_id in seen:
+                        continue
+                    seen.add(task_id)
+                    task_words = self.task_words[task_id]
+                    total = 0.0
+                    for j, known in enumerate(similarities):
+                        best = 0.0
+                        for other in task_words:
+                            value = known.get(other)
+                            if value is None:
+                                value = similarity(j, other)
+                            if value > best:
+                                best = value
+                        total += best
+                    score = total / len(query_words)
+                    if score < threshold:
+                        continue
+                    entry = (score, -task_id)
+                    if len(top) < limit:
+                        heapq.heappush(top, entry)
+                    elif entry > top[0]:
+                        heapq.heapreplace(top, entry)
+
+        return [(score, -neg_id) for score, neg_id in sorted(top, reverse=True)]
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+To-Do HTTP Service
+Exposes the task store as a small JSON API on a threaded HTTP server.
+
+Endpoints:
+    GET    /tasks?filter=Pending&offset=0&limit=50   list tasks (paginated)
+    GET    /tasks/<id>                               one task
+    POST   /tasks              {"description", "priority", "due"}   add_task
+    POST   /tasks/<id>/complete                      complete_task
+    DELETE /tasks/<id>                               delete_task
+    GET    /search?q=milk&offset=0&limit=50          search_tasks
+    GET    /search?q=mlik&fuzzy=1                    typo-tolerant search_tasks
+    GET    /stats                                    update_stats
+
+GET responses carry an ETag built from a per-process nonce and the store
+version, so clients can poll with If-None-Match and get an empty 304 until
+something changes (and never a stale 304 from before a restart).
+Fuzzy search ranks at most FUZZY_CAP matches; its total counts those only.
+Connections are kept alive (HTTP/1.1).
+
+Usage:
+    python todo_server.py --port 8765 --file tasks.json
+
+Do not point a standalone server at the file an open GUI is using: each
+process would overwrite the other's changes. Start the GUI with
+TODO_API_PORT=8765 instead to serve its store from inside the GUI.
+"""
+
+import argparse
+import json
+import threading
+import uuid
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+from todo_core import TaskStore, FILTERS
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+# Fuzzy matches ranked per query; results and totals stop here
+FUZZY_CAP = 1000
+# Replication bookkeeping (see todo_sync) that API clients never see
+INTERNAL_FIELDS = ("uid", "_stamps")
+
+
+class ApiError(Exception):
+    """An error that maps directly onto an HTTP status code."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class TaskService:
+    """Thread-safe facade over a TaskStore.
+
+    All reads and writes happen under one lock. Saving is write-behind: a
+    mutation marks the store dirty and a background thread flushes it at most
+    once per save_interval seconds, so bursts of writes cost one file dump.
+    Serialized GET bodies are cached until the next mutation.
+    """
+
+    def __init__(self, store: TaskStore, save_interval: float = 0.5):
+        self.store = store
+        self.lock = threading.RLock()
+        self.save_interval = save_interval
+        self._dirty = threading.Event()
+        self._stopping = threading.Event()
+        self._cache = {}
+        self._cache_version = store.version
+        # Store versions restart at zero with the process; the nonce keeps
+        # ETags from an earlier run from matching
+        self._nonce = uuid.uuid4().hex[:8]
+        self._saver = threading.Thread(target=self._save_loop, name="todo-saver", daemon=True)
+        self._saver.start()
+
+    # -- persistence -------------------------------------------------------
+
+    def _save_loop(self):
+        while not self._stopping.is_set():
+            self._dirty.wait()
+            self._stopping.wait(self.save_interval)
+            self.flush()
+
+    def flush(self):
+        """Write the store to disk if there are unsaved changes."""
+        with self.lock:
+            if not self._dirty.is_set():
+                return
+            self._dirty.clear()
+            self.store.save()
+
+    def close(self):
+        """Stop the background saver and write any pending changes."""
+        self._stopping.set()
+        self._dirty.set()
+        self._saver.join()
+        self.flush()
+
+    def _changed(self):
+        self._dirty.set()
+
+    # -- cached reads ------------------------------------------------------
+
+    def cached(self, key, build):
+        """Return (etag, body) for key, rebuilding only after a mutation."""
+        with self.lock:
+            version = self.store.version
+            if version != self._cache_version:
+                self._cache.clear()
+                self._cache_version = version
+            hit = self._cache.get(key)
+            if hit is None:
+                body = json.dumps(build()).encode()
+                hit = (f'"{self._nonce}-{version}"', body)
+                self._cache[key] = hit
+            return hit
+
+    # -- operations --------------------------------------------------------
+
+    def list_tasks(self, filter_type, offset, limit):
+        if filter_type not in FILTERS:
+            raise ApiError(400, f"filter must be one of {', '.join(FILTERS)}")
+        return page(self.store.filtered(filter_type), offset, limit)
+
+    def get_task(self, task_id):
+        task = self.store.get(task_id)
+        if task is None:
+            raise ApiError(404, f"No task with ID {task_id}")
+        return public_task(task)
+
+    def search_tasks(self, keyword, offset, limit, fuzzy=False):
+        if not keyword:
+            raise ApiError(400, "q parameter is required")
+        if fuzzy:
+            # Ranking every weak match would cost more than the page is worth;
+            # "capped" tells the client the total stopped at FUZZY_CAP
+            matches = self.store.fuzzy_search(keyword, FUZZY_CAP)
+            result = page(matches, offset, limit)
+            result["capped"] = len(matches) >= FUZZY_CAP
+            return result
+        return page(sorted(self.store.search(keyword), key=lambda t: t["id"]), offset, limit)
+
+    def update_stats(self):
+        return self.store.stats()
+
+    def add_task(self, description, priority, due=None):
+        with self.lock:
+            try:
+                task = self.store.add(description, priority, due)
+            except ValueError as e:
+                raise ApiError(400, str(e))
+            self._changed()
+            return public_task(task)
+
+    def complete_task(self, task_id):
+        with self.lock:
+            try:
+                changed = self.store.complete(task_id)
+            except KeyError:
+                raise ApiError(404, f"No task with ID {task_id}")
+            if changed:
+                self._changed()
+            return {"task": public_task(self.store.get(task_id)), "changed": changed}
+
+    def delete_task(self, task_id):
+        with self.lock:
+            try:
+                task = self.store.delete(task_id)
+            except KeyError:
+                raise ApiError(404, f"No task with ID {task_id}")
+            self._changed()
+            return public_task(task)
+
+
+def public_task(task):
+    """Copy of a task without the internal replication fields."""
+    return {k: v for k, v in task.items() if k not in INTERNAL_FIELDS}
+
+
+def page(tasks, offset, limit):
+    """Slice a task list and wrap it with pagination metadata."""
+    return {
+        "total": len(tasks),
+        "offset": offset,
+        "limit": limit,
+        "tasks": [public_task(t) for t in tasks[offset:offset + limit]],
+    }
+
+
+def int_param(query, name, default, minimum=0, maximum=None):
+    values = query.get(name)
+    if not values:
+        return default
+    try:
+        value = int(values[0])
+    except ValueError:
+        raise ApiError(400, f"{name} must be an integer")
+    if value < minimum or (maximum is not None and value > maximum):
+        raise ApiError(400, f"{name} out of range")
+    return value
+
+
+def parse_task_id(text):
+    try:
+        return int(text)
+    except ValueError:
+        raise ApiError(404, "Not found")
+
+
+class TaskRequestHandler(BaseHTTPRequestHandler):
+    """Routes HTTP requests to the TaskService attached to the server."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "TodoService/1.0"
+    # Headers and body go out in separate writes; without TCP_NODELAY the
+    # second write waits on the client's delayed ACK (~40 ms per request).
+    disable_nagle_algorithm = True
+
+    @property
+    def service(self) -> TaskService:
+        return self.server.service
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    # -- responses ---------------------------------------------------------
+
+    def send_body(self, status, body, etag=None):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, status, payload):
+        self.send_body(status, json.dumps(payload).encode())
+
+    def send_cached(self, key, build):
+        etag, body = self.service.cached(key, build)
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_body(200, body, etag)
+
+    def read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            payload = json.loads(self.rfile.read(length))
+        except json.JSONDecodeError:
+            raise ApiError(400, "Request body is not valid JSON")
+        if not isinstance(payload, dict):
+            raise ApiError(400, "Request body must be a JSON object")
+        return payload
+
+    def dispatch(self, handler):
+        try:
+            handler()
+        except ApiError as e:
+            self.send_json(e.status, {"error": e.message})
+
+    # -- routing -----------------------------------------------------------
+
+    def do_GET(self):
+        self.dispatch(self.handle_get)
+
+    def do_POST(self):
+        self.dispatch(self.handle_post)
+
+    def do_DELETE(self):
+        self.dispatch(self.handle_delete)
+
+    def handle_get(self):
+        url = urlsplit(self.path)
+        parts = [p for p in url.path.split("/") if p]
+        query = parse_qs(url.query)
+        offset = int_param(query, "offset", 0)
+        limit = int_param(query, "limit", DEFAULT_LIMIT, 1, MAX_LIMIT)
+
+        if parts == ["tasks"]:
+            filter_type = query.get("filter", ["All"])[0]
+            if filter_type in ("Due Soon", "Overdue"):
+                # Depends on the clock, not just the store version; never cached
+                with self.service.lock:
+                    body = self.service.list_tasks(filter_type, offset, limit)
+                self.send_json(200, body)
+            else:
+                self.send_cached(("tasks", filter_type, offset, limit),
+                                 lambda: self.service.list_tasks(filter_type, offset, limit))
+        elif len(parts) == 2 and parts[0] == "tasks":
+            task_id = parse_task_id(parts[1])
+            self.send_cached(("task", task_id), lambda: self.service.get_task(task_id))
+        elif parts == ["search"]:
+            keyword = query.get("q", [""])[0]
+            fuzzy = query.get("fuzzy", ["0"])[0] not in ("", "0")
+            self.send_cached(("search", keyword.lower(), fuzzy, offset, limit),
+                             lambda: self.service.search_tasks(keyword, offset, limit, fuzzy))
+        elif parts == ["stats"]:
+            self.send_cached(("stats",), self.service.update_stats)
+        else:
+            raise ApiError(404, "Not found")
+
+    def handle_post(self):
+        parts = [p for p in urlsplit(self.path).path.split("/") if p]
+        # Always consume the body so a kept-alive connection stays in sync
+        payload = self.read_json()
+        if parts == ["tasks"]:
+            description = payload.get("description")
+            if not isinstance(description, str):
+                raise ApiError(400, "description is required")
+            priority = payload.get("priority", "medium")
+            if not isinstance(priority, str):
+                raise ApiError(400, "priority must be a string")
+            due = payload.get("due")
+            if due is not None and not isinstance(due, str):
+                raise ApiError(400, "due must be a string")
+            self.send_json(201, self.service.add_task(description, priority, due))
+        elif len(parts) == 3 and parts[0] == "tasks" and parts[2] == "complete":
+            self.send_json(200, self.service.complete_task(parse_task_id(parts[1])))
+        else:
+            raise ApiError(404, "Not found")
+
+    def handle_delete(self):
+        parts = [p for p in urlsplit(self.path).path.split("/") if p]
+        if len(parts) == 2 and parts[0] == "tasks":
+            self.send_json(200, self.service.delete_task(parse_task_id(parts[1])))
+        else:
+            raise ApiError(404, "Not found")
+
+
+class TaskServer(ThreadingHTTPServer):
+    """Threaded HTTP server bound to one TaskService."""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address, service: TaskService, verbose=False):
+        super().__init__(address, TaskRequestHandler)
+        self.service = service
+        self.verbose = verbose
+
+
+def serve(filename="tasks.json", host="127.0.0.1", port=8765, verbose=False):
+    """Run the service until interrupted, saving pending changes on exit."""
+    store = TaskStore(filename)
+    store.build_index()
+    service = TaskService(store)
+    server = TaskServer((host, port), service, verbose)
+    print(f"Serving {filename} on http://{host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the to-do list as a JSON API.")
+    parser.add_argument("-f", "--file", default="tasks.json", help="task file (default: tasks.json)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+    serve(args.file, args.host, args.port, args.verbose)
+
+
+if __name__ == "__main__":
+    main()
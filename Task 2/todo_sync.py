@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+To-Do Replica Sync
+Delta synchronisation of task stores through a small sync server.
+
+Every replica stamps each field change with a [clock, replica] logical
+version (see todo_core). A sync is a single POST /sync exchange: the
+replica pushes the tasks it changed since its last successful sync and
+pulls every field the server accepted after the server sequence number it
+last saw. Both sides merge field by field, keeping the higher stamp, so
+replicas converge whatever order syncs happen in; deletes win over edits.
+
+The server keeps the merged state in memory, with per-field sequence
+numbers, and appends accepted changes to an NDJSON journal, so a sync
+touches only the changed tasks on both sides.
+
+Usage:
+    python todo_sync.py serve --port 8766 --journal sync.ndjson
+    python todo_cli.py sync http://127.0.0.1:8766
+"""
+
+import argparse
+import http.client
+import json
+import os
+import threading
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List, Tuple
+from urllib.parse import urlsplit
+
+import perfmon
+from todo_core import TaskStore
+from todo_server import ApiError
+
+
+class SyncLog:
+    """Server-side merged state of all replicas, with a change journal."""
+
+    def __init__(self, journal: str = None):
+        self.lock = threading.Lock()
+        # uid -> {field: [value, stamp, seq]}
+        self.state: Dict[str, Dict[str, List]] = {}
+        # uid -> latest seq, kept in seq order so deltas are read from the end
+        self.order: "OrderedDict[str, int]" = OrderedDict()
+        self.seq = 0
+        self.journal = journal
+        self._journal_file = None
+        if journal:
+            lines = self._replay()
+            if lines > 2 * len(self.state) + 1000:
+                self._compact()
+            self._journal_file = open(journal, 'a')
+
+    def close(self):
+        if self._journal_file is not None:
+            self._journal_file.close()
+
+    # -- journal -----------------------------------------------------------
+
+    def _replay(self) -> int:
+        lines = 0
+        try:
+            with open(self.journal, 'r') as f:
+                for line in f:
+                    lines += 1
+                    try:
+                        uid, fields = json.loads(line)
+                    except ValueError:
+                        continue  # Torn write at the end of the file
+                    self._restore(uid, fields)
+        except FileNotFoundError:
+            pass
+        return lines
+
+    def _restore(self, uid, fields):
+        entry = self.state.setdefault(uid, {})
+        if "deleted" in fields:
+            entry.clear()
+        elif "deleted" in entry:
+            return
+        for field, value in fields.items():
+            entry[field] = value
+            self.seq = max(self.seq, value[2])
+        self.order[uid] = max(value[2] for value in entry.values())
+        self.order.move_to_end(uid)
+
+    def _compact(self):
+        """Rewrite the journal with one line per task, keeping sequence numbers."""
+        tmp_name = self.journal + ".tmp"
+        with open(tmp_name, 'w') as f:
+            for uid in self.order:
+                f.write(json.dumps([uid, self.state[uid]]) + "\n")
+        os.replace(tmp_name, self.journal)
+
+    # -- merging -----------------------------------------------------------
+
+    def merge(self, uid: str, fields: Dict[str, List]) -> Dict[str, List]:
+        """Merge one task's fields; returns the fields that won, with their new seq."""
+        entry = self.state.setdefault(uid, {})
+        if "deleted" in entry:
+            return {}
+        if "deleted" in fields:
+            self.seq += 1
+            entry.clear()
+            accepted = {"deleted": [True, fields["deleted"][1], self.seq]}
+        else:
+            accepted = {}
+            for field, (value, stamp) in fields.items():
+                current = entry.get(field)
+                if current is None or stamp > current[1]:
+                    accepted[field] = [value, stamp]
+            if not accepted:
+                return {}
+            self.seq += 1
+            for value in accepted.values():
+                value.append(self.seq)
+        entry.update(accepted)
+        self.order[uid] = self.seq
+        self.order.move_to_end(uid)
+        return accepted
+
+    def exchange(self, replica: str, since: int, changes: Dict[str, Dict]) -> Dict:
+        """Apply a replica's changes and return everything newer than since
+        that the replica did not write itself, in ascending seq order."""
+        with self.lock:
+            for uid, fields in changes.items():
+                accepted = self.merge(uid, fields)
+                if accepted and self._journal_file is not None:
+                    self._journal_file.write(json.dumps([uid, accepted]) + "\n")
+            if self._journal_file is not None:
+                self._journal_file.flush()
+
+            if since > self.seq:
+                since = 0  # The server lost its state; resend everything
+            # Walk back only as far as since, then reverse so the replica
+            # creates unknown tasks (and numbers them) in server order
+            newer = []
+            for uid, seq in reversed(self.order.items()):
+                if seq <= since:
+                    break
+                newer.append(uid)
+            delta = {}
+            for uid in reversed(newer):
+                fields = {field: [value, stamp] for field, (value, stamp, field_seq)
+                          in self.state[uid].items()
+                          if field_seq > since and stamp[1] != replica}
+                if fields:
+                    delta[uid] = fields
+            return {"seq": self.seq, "changes": delta}
+
+
+def valid_changes(changes) -> bool:
+    """Check the {uid: {field: [value, [clock, replica]]}} shape before merging."""
+    if not isinstance(changes, dict):
+        return False
+    for fields in changes.values():
+        if not isinstance(fields, dict):
+            return False
+        for value in fields.values():
+            if not (isinstance(value, list) and len(value) == 2 and isinstance(value[1], list)
+                    and len(value[1]) == 2 and isinstance(value[1][0], int)
+                    and isinstance(value[1][1], str)):
+                return False
+    return True
+
+
+class SyncRequestHandler(BaseHTTPRequestHandler):
+    """POST /sync {"replica", "since", "changes"} -> {"seq", "changes"}."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "TodoSync/1.0"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+        try:
+            if urlsplit(self.path).path != "/sync":
+                raise ApiError(404, "Not found")
+            try:
+                request = json.loads(body)
+                replica, since, changes = request["replica"], request["since"], request["changes"]
+            except (ValueError, KeyError, TypeError):
+                raise ApiError(400, "Expected {replica, since, changes}")
+            if not isinstance(replica, str) or not isinstance(since, int) or not valid_changes(changes):
+                raise ApiError(400, "Expected {replica, since, changes}")
+            self.send_json(200, self.server.log.exchange(replica, since, changes))
+        except ApiError as e:
+            self.send_json(e.status, {"error": e.message})
+
+
+class SyncServer(ThreadingHTTPServer):
+    """Threaded HTTP server in front of one SyncLog."""
+
+    daemon_threads = True
+
+    def __init__(self, address, log: SyncLog, verbose=False):
+        super().__init__(address, SyncRequestHandler)
+        self.log = log
+        self.verbose = verbose
+
+
+class SyncClient:
+    """Keep-alive HTTP client for a sync server. Does not touch the store."""
+
+    def __init__(self, url: str, timeout: float = 10):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self.conn = None
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def exchange(self, request: Dict) -> Tuple[Dict, int, int]:
+        """POST one sync request; returns (response, bytes sent, bytes received)."""
+        body = json.dumps(request).encode()
+        for attempt in (1, 2):
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                self.conn.request("POST", "/sync", body, {"Content-Type": "application/json"})
+                response = self.conn.getresponse()
+                data = response.read()
+                break
+            except (http.client.HTTPException, ConnectionError):
+                # Stale kept-alive connection; reconnect once
+                self.close()
+                if attempt == 2:
+                    raise
+        if response.status != 200:
+            raise ConnectionError(f"Sync failed: HTTP {response.status} {data[:200]!r}")
+        return json.loads(data), len(body), len(data)
+
+
+def prepare(store: TaskStore) -> Tuple[Dict, Dict[str, int]]:
+    """Build the sync request for store; returns (request, pushed uids -> clock)."""
+    pushed = dict(store.unpushed)
+    changes = {uid: store.replicated_fields(uid) for uid in pushed}
+    return {"replica": store.replica, "since": store.sync_seq, "changes": changes}, pushed
+
+
+def finish(store: TaskStore, pushed: Dict[str, int], response: Dict) -> int:
+    """Apply a sync response to store; returns how many tasks changed.
+
+    Uids changed again locally while the request was in flight stay queued.
+    """
+    for uid, clock in pushed.items():
+        if store.unpushed.get(uid) == clock:
+            del store.unpushed[uid]
+    changed = sum(store.apply_remote(uid, fields) for uid, fields in response["changes"].items())
+    store.sync_seq = response["seq"]
+    return changed
+
+
+@perfmon.timed("todo.sync")
+def sync(store: TaskStore, client: SyncClient) -> Dict:
+    """Run one push/pull exchange and save the store."""
+    request, pushed = prepare(store)
+    response, sent, received = client.exchange(request)
+    pulled = finish(store, pushed, response)
+    store.save()
+    perfmon.count("todo.sync_bytes_sent", sent)
+    perfmon.count("todo.sync_bytes_received", received)
+    return {"pushed": len(request["changes"]), "pulled": pulled, "sent": sent, "received": received}
+
+
+def serve(host="127.0.0.1", port=8766, journal="sync.ndjson", verbose=False):
+    log = SyncLog(journal)
+    server = SyncServer((host, port), log, verbose)
+    print(f"Sync server on http://{host}:{server.server_port} (journal: {journal})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        log.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="To-do replica sync server.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("serve", help="run the sync server")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8766)
+    p.add_argument("--journal", default="sync.ndjson", help="change journal (default: sync.ndjson)")
+    p.add_argument("-v", "--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+    serve(args.host, args.port, args.journal, args.verbose)
+
+
+if __name__ == "__main__":
+    main()